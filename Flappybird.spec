@@ -5,16 +5,16 @@ a = Analysis(
     ['Flappybird.py'],
     pathex=['D:/Python/Flappybird'],
     binaries=[],
-    datas=[('Bird4.png', '.'),
-    ('records.txt', '.'),
-    ('Bird5.png', '.'),
-    ('Bird8.png', '.'),
-    ('pipe_ts.png', '.')],
+    # Картинки — одним файлом уже раскодированных пикселей, собрать заранее:
+    # python asset_bundle.py build
+    datas=[('assets.pak', '.'),
+    ('autopilot.bin', '.')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    # pygame.pkgdata обходится без pkg_resources, а его импорт — заметная часть старта
+    excludes=['pkg_resources'],
     noarchive=False,
     optimize=0,
 )
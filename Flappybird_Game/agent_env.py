@@ -0,0 +1,165 @@
+"""Среда для обучаемых агентов: пиксельные наблюдения низкого разрешения.
+
+Кадр рисуется не на экран 1200x600, а в маленькую поверхность (по
+умолчанию 84x84, оттенки серого): только фон, трубы и птица, без текста и
+меню — как в цикле отрисовки main.py, но заранее уменьшенными спрайтами.
+Поверхность создана поверх массива NumPy (pygame.image.frombuffer), так что
+наблюдение — это сам массив, без копирования. (Вид из
+pygame.surfarray.pixels2d держал бы поверхность заблокированной, и blit в
+неё был бы невозможен.)
+
+    env = FlappyEnv()
+    obs = env.reset(seed=1)
+    obs, reward, done = env.step(True)
+
+Наблюдение перезаписывается следующим step(); если кадры нужно хранить,
+копируйте их (obs.copy()).
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from typing import List, Optional, Tuple
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np  # noqa: E402
+import pygame  # noqa: E402
+
+from collision import BIRD_FILES, HERE, PIPE_FILE  # noqa: E402
+from sim import FlappyConfig, FlappySim  # noqa: E402
+
+SKY = (135, 205, 250)
+GRAY_PALETTE = [(i, i, i) for i in range(256)]
+
+
+def _luminance(rgb: np.ndarray) -> np.ndarray:
+    return (rgb[..., 0] * 0.299 + rgb[..., 1] * 0.587 + rgb[..., 2] * 0.114).astype(np.uint8)
+
+
+def _gray_sprite(surface: pygame.Surface) -> pygame.Surface:
+    """8-битная серая копия; прозрачные пиксели — индекс 0 (colorkey)."""
+    lum = _luminance(pygame.surfarray.array3d(surface))
+    lum = np.maximum(lum, 1)  # 0 занят под прозрачность
+    lum[pygame.surfarray.array_alpha(surface) < 128] = 0
+    sprite = pygame.Surface(surface.get_size(), 0, 8)
+    sprite.set_palette(GRAY_PALETTE)
+    pygame.surfarray.blit_array(sprite, lum)
+    sprite.set_colorkey(0)
+    return sprite
+
+
+class FlappyEnv:
+    """Flappy bird как среда: reset(seed) -> obs, step(flap) -> (obs, reward, done)."""
+
+    def __init__(
+        self,
+        size: Tuple[int, int] = (84, 84),
+        grayscale: bool = True,
+        frame_skip: int = 1,
+        config: Optional[FlappyConfig] = None,
+        alive_reward: float = 0.1,
+        pipe_reward: float = 1.0,
+        death_reward: float = -1.0,
+    ) -> None:
+        self.sim = FlappySim(config)
+        cfg = self.sim.config
+        self.size = size
+        self.frame_skip = frame_skip
+        self.alive_reward = alive_reward
+        self.pipe_reward = pipe_reward
+        self.death_reward = death_reward
+        w, h = size
+        self.sx = w / cfg.width
+        self.sy = h / cfg.height
+
+        # Массив — это и есть память поверхности: (высота, ширина[, 3])
+        if grayscale:
+            self.pixels = np.zeros((h, w), dtype=np.uint8)
+            self.surface = pygame.image.frombuffer(self.pixels, size, "P")
+            self.surface.set_palette(GRAY_PALETTE)
+            self.background = int(_luminance(np.array(SKY)))
+        else:
+            self.pixels = np.zeros((h, w, 3), dtype=np.uint8)
+            self.surface = pygame.image.frombuffer(self.pixels, size, "RGB")
+            self.background = SKY
+
+        def load(name: str) -> pygame.Surface:
+            image = pygame.image.load(os.path.join(HERE, name))
+            iw, ih = image.get_size()
+            small = pygame.transform.smoothscale(image, (max(1, round(iw * self.sx)), max(1, round(ih * self.sy))))
+            return _gray_sprite(small) if grayscale else small
+
+        self.birds: List[pygame.Surface] = [load(name) for name in BIRD_FILES]
+        self.pipe = load(PIPE_FILE)
+        self.pipe_top = pygame.transform.flip(self.pipe, False, True)
+        self.reset()
+
+    @property
+    def observation(self) -> np.ndarray:
+        return self.pixels
+
+    def reset(self, seed: Optional[int] = None) -> np.ndarray:
+        self.sim.reset(seed)
+        return self.render()
+
+    def step(self, flap: bool) -> Tuple[np.ndarray, float, bool]:
+        """Прыжок (или нет) и frame_skip тиков симуляции; прыжок — только в первом."""
+        sim = self.sim
+        reward = 0.0
+        for i in range(self.frame_skip):
+            score = sim.score
+            alive = sim.step(bool(flap) and i == 0)
+            reward += (sim.score - score) * self.pipe_reward
+            if not alive:
+                reward += self.death_reward
+                break
+            reward += self.alive_reward
+        return self.render(), reward, not sim.alive
+
+    def render(self) -> np.ndarray:
+        """Нарисовать текущее состояние в self.pixels и вернуть его."""
+        sim = self.sim
+        cfg = sim.config
+        sx, sy = self.sx, self.sy
+        surface = self.surface
+        surface.fill(self.background)
+        pipe_h = self.pipe.get_height()
+        for pipe_x, pipe_y, _ in sim.iter_pipes():
+            x = round(pipe_x * sx)
+            surface.blit(self.pipe, (x, round((pipe_y + cfg.pipe_gap) * sy)))
+            surface.blit(self.pipe_top, (x, round(pipe_y * sy) - pipe_h))
+        surface.blit(self.birds[int(sim.bird_index)], (round(cfg.bird_x * sx), round(sim.bird_y * sy)))
+        return self.pixels
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Скорость среды со случайной политикой")
+    parser.add_argument("--steps", type=int, default=20000)
+    parser.add_argument("--size", type=int, default=84)
+    parser.add_argument("--rgb", action="store_true")
+    parser.add_argument("--save", help="сохранить последний кадр в PNG")
+    args = parser.parse_args(argv)
+
+    env = FlappyEnv((args.size, args.size), grayscale=not args.rgb)
+    rng = np.random.default_rng(0)
+    env.reset(0)
+    episodes = 0
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        _, _, done = env.step(rng.random() < 0.06)
+        if done:
+            episodes += 1
+            env.reset(episodes)
+    elapsed = time.perf_counter() - start
+    print(f"{args.steps} шагов за {elapsed:.2f} с: {args.steps / elapsed:.0f} шагов/с, эпизодов {episodes}")
+    if args.save:
+        pygame.image.save(env.surface, args.save)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""Все картинки игры одним файлом с уже раскодированными пикселями.
+
+PyInstaller-сборка (Flappybird.spec) при каждом запуске распаковывала и
+заново декодировала каждый PNG. Вместо них в сборку кладётся assets.pak:
+заголовок, индекс (имя, смещение, ширина, высота) и пиксели подряд в
+формате BGRA — в памяти это ARGB8888, тот же формат, что convert_alpha()
+даёт для экрана, так что поверхности не нужно ни декодировать, ни
+конвертировать. Файл отображается в память (mmap), image() создаёт
+поверхность прямо поверх отображения через pygame.image.frombuffer:
+ничего не копируется, страницы читаются с диска при первой отрисовке.
+Каждый блок выровнен по ALIGN байт.
+
+Какие картинки нужны, определяется так же, как для веб-сборки
+(build_web.py): строковые литералы модулей, достижимых из main.py.
+Поверхности из пакета — общие и только для чтения: рисовать поверх них
+нельзя (copy(), как делает party.tint, — можно).
+
+    python asset_bundle.py build   # -> assets.pak, перед сборкой PyInstaller
+    python asset_bundle.py check   # сравнить с PNG и замерить загрузку
+"""
+
+from __future__ import annotations
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pygame
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BUNDLE_FILE = "assets.pak"
+MAGIC = b"FPAK"
+VERSION = 1
+ALIGN = 64
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".gif", ".bmp")
+# magic, версия, число картинок
+HEADER = struct.Struct("<4sHH")
+# имя (utf-8, дополнено нулями), смещение пикселей, ширина, высота
+ENTRY = struct.Struct("<32sIHH")
+
+
+def referenced_images(entry: str = "main.py") -> List[str]:
+    """Картинки, на которые ссылаются модули игры (как в build_web.py)."""
+    from build_web import local_modules, referenced_assets
+
+    return [name for name in referenced_assets(local_modules(entry)) if name.lower().endswith(IMAGE_EXTS)]
+
+
+def pack(names: Iterable[str], directory: str = HERE) -> bytes:
+    """Собрать пакет из картинок directory; декодирует их один раз — здесь."""
+    images: List[Tuple[str, int, int, bytes]] = []
+    for name in names:
+        if len(name.encode("utf-8")) > 32:
+            raise ValueError(f"слишком длинное имя для пакета: {name}")
+        surface = pygame.image.load(os.path.join(directory, name))
+        images.append((name, *surface.get_size(), pygame.image.tobytes(surface, "BGRA")))
+
+    offset = HEADER.size + ENTRY.size * len(images)
+    index = [HEADER.pack(MAGIC, VERSION, len(images))]
+    blobs: List[bytes] = []
+    for name, width, height, pixels in images:
+        pad = -offset % ALIGN
+        blobs.append(bytes(pad))
+        offset += pad
+        index.append(ENTRY.pack(name.encode("utf-8"), offset, width, height))
+        blobs.append(pixels)
+        offset += len(pixels)
+    return b"".join(index + blobs)
+
+
+class AssetBundle:
+    """Отображённый в память пакет; image(имя) — поверхность без декодирования."""
+
+    def __init__(self, data, index: Dict[str, Tuple[int, int, int]]) -> None:
+        self.data = data
+        self.index = index
+        self._view = memoryview(data)
+
+    @classmethod
+    def open(cls, path: str) -> "AssetBundle":
+        """Отобразить пакет в память; ValueError, если это не assets.pak."""
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(data) < HEADER.size:
+            raise ValueError(f"{path}: не пакет картинок")
+        magic, version, count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: не пакет картинок")
+        index: Dict[str, Tuple[int, int, int]] = {}
+        for i in range(count):
+            raw, offset, width, height = ENTRY.unpack_from(data, HEADER.size + ENTRY.size * i)
+            if offset + width * height * 4 > len(data):
+                raise ValueError(f"{path}: пакет обрезан")
+            index[raw.rstrip(b"\0").decode("utf-8")] = (offset, width, height)
+        return cls(data, index)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    def names(self) -> List[str]:
+        return sorted(self.index)
+
+    def image(self, name: str) -> pygame.Surface:
+        offset, width, height = self.index[name]
+        return pygame.image.frombuffer(self._view[offset:offset + width * height * 4], (width, height), "BGRA")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Пакет картинок для быстрого старта сборки")
+    sub = parser.add_subparsers(dest="command", required=True)
+    b = sub.add_parser("build", help="собрать пакет")
+    b.add_argument("--out", default=os.path.join(HERE, BUNDLE_FILE))
+    b.add_argument("names", nargs="*", help="картинки (по умолчанию — все, что использует main.py)")
+    c = sub.add_parser("check", help="сравнить пакет с PNG и замерить загрузку")
+    c.add_argument("--bundle", default=os.path.join(HERE, BUNDLE_FILE))
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        names = args.names or referenced_images()
+        data = pack(names)
+        with open(args.out, "wb") as f:
+            f.write(data)
+        print(f"{args.out}: {len(names)} картинок ({', '.join(names)}), {len(data)} байт")
+        return 0
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    start = time.perf_counter()
+    bundle = AssetBundle.open(args.bundle)
+    from_pack = {name: bundle.image(name) for name in bundle.names()}
+    pack_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    from_png = {name: pygame.image.load(os.path.join(HERE, name)).convert_alpha() for name in bundle.names()}
+    png_ms = (time.perf_counter() - start) * 1000
+    bad = [name for name in from_pack
+           if pygame.image.tobytes(from_pack[name], "RGBA") != pygame.image.tobytes(from_png[name], "RGBA")]
+    print(f"{len(from_pack)} картинок: пакет {pack_ms:.2f} мс, PNG + convert_alpha {png_ms:.2f} мс")
+    if bad:
+        print("не совпадают с PNG (пересоберите пакет):", ", ".join(bad))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+"""Ленивая подгрузка картинок в веб-версии.
+
+build_web.py кладёт картинки не в apk, а в lazy/ рядом с index.html, чтобы
+меню появлялось раньше. После первого кадра main.py вызывает fetch(), файлы
+скачиваются в рабочую папку и дальше грузятся как обычно. На десктопе и в
+PyInstaller-сборке файлы уже на месте, fetch() ничего не делает.
+
+Без файлов из OPTIONAL игра обходится: если их не удалось скачать, fetch()
+только сообщает об этом, а main.py выключает то, что от них зависит.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from typing import Iterable
+
+# Не нужны до нажатия Start (autopilot.bin — до демо-режима)
+LAZY = ("Bird4.png", "Bird5.png", "Bird8.png", "pipe_ts.png", "autopilot.bin")
+# Без них игра идёт дальше (без autopilot.bin — без демо-режима)
+OPTIONAL = frozenset({"autopilot.bin"})
+
+
+async def fetch(names: Iterable[str] = LAZY, base_url: str = "lazy/") -> None:
+    """Скачать недостающие файлы (только в браузере)."""
+    if sys.platform != "emscripten":
+        return
+    import platform  # модуль pygbag, подменяет стандартный в браузере
+
+    for name in names:
+        if os.path.exists(name):
+            continue
+        try:
+            async with platform.fopen(base_url + name, "rb") as f:
+                f.rename_to(name)
+        except Exception as e:  # чем кончится 404, решает pygbag
+            if name not in OPTIONAL:
+                raise
+            print(f"{name} не загружен: {e}")
@@ -0,0 +1,306 @@
+"""Автопилот для демо-режима: одно обращение к таблице за кадр.
+
+Таблица строится заранее (python autopilot.py build) и хранит бит
+«прыгать / не прыгать» для каждого состояния: dx до ближайшей опасной
+трубы, dy птицы относительно её зазора, скорость птицы и разница высот
+зазоров этой и следующей трубы (корзинами по bin_size пикселей). Трубы
+всегда стоят на x, кратных pipe_speed, а скорость птицы принимает
+значения flap_speed + k * gravity, поэтому dx и скорость дискретны точно,
+а dy берётся с шагом 1 пиксель.
+
+Построение — динамическое программирование от трубы к птице: слой dx
+зависит только от слоя dx - pipe_speed. Состояние «безопасно», если есть
+действие, после которого птица не задевает трубу (по непрозрачным
+границам спрайтов, с запасом на округление dy) и попадает в безопасное
+состояние. Сначала считается таблица «следующая труба ещё не видна» (за
+трубой — лишь бы остаться на экране), затем по таблице на каждую корзину:
+за трубой птица должна попасть в безопасное состояние для следующей трубы
+при любой разнице зазоров из корзины. Корзины считаются параллельно, по
+процессу на ядро. Решение — не прыгать, если это безопасно; где спасения
+нет, берётся решение таблицы «следующая не видна».
+
+Играть бесконечно на любой трассе нельзя: бывают подряд скачки зазора
+почти на всю высоту экрана, которые не успеть пролететь при этой физике.
+Такое случается редко (в среднем через сотни труб), демо-режим просто
+начинает игру заново.
+
+    python autopilot.py build          # -> autopilot.bin
+    python autopilot.py check --ticks 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import multiprocessing
+import os
+import struct
+import sys
+import time
+import zlib
+from typing import List, NamedTuple, Optional, Tuple
+
+from sim import FlappyConfig, FlappySim
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+TABLE_FILE = os.path.join(HERE, "autopilot.bin")
+MAGIC = b"FLAP"
+VERSION = 1
+# magic, версия, dx_min, dx_max, шаг dx, dy_min, число dy, число скоростей,
+# размах и шаг корзин разницы зазоров, v_min, gravity, flap_speed, pipe_gap
+HEADER = struct.Struct("<4sBhhHhHHHHdddH")
+
+
+class Geometry(NamedTuple):
+    """Размеры сетки и границы столкновений (передаются воркерам)."""
+
+    dx_min: int
+    dx_max: int
+    dx_step: int
+    dy_min: int
+    ny: int
+    nv: int
+    gap_span: int  # разница зазоров соседних труб лежит в [-gap_span, gap_span]
+    bin_size: int
+    v_min: float
+    gravity: float
+    flap_speed: float
+    pipe_gap: int
+    hit_dx: Tuple[int, int] = (0, 0)  # труба опасна при hit_dx[0] < dx < hit_dx[1]
+    safe_dy: Tuple[int, int] = (0, 0)  # в зазоре при safe_dy[0] <= dy <= safe_dy[1]
+
+    @property
+    def layers(self) -> int:
+        return (self.dx_max - self.dx_min) // self.dx_step + 1
+
+    @property
+    def bins(self) -> int:
+        return 2 * self.gap_span // self.bin_size + 1
+
+    def bin(self, gap: int, next_gap: int) -> int:
+        return (next_gap - gap + self.gap_span) // self.bin_size
+
+
+def geometry(config: FlappyConfig, masks=None, v_max: float = 20.0, bin_size: int = 50) -> Geometry:
+    """Сетка для config; границы спрайтов — по маскам (непрозрачная часть).
+
+    dy ограничен так, чтобы при любом зазоре птица оставалась на экране:
+    ниже пола она разбивается, выше верхнего края пролетела бы над трубой.
+    """
+    if masks is None:
+        from collision import default_masks
+
+        masks = default_masks()
+    bird = [m.get_bounding_rects()[0] for m in masks.bird]
+    pipe = masks.pipe_bottom.get_bounding_rects()[0]
+    bl, br = min(r.left for r in bird), max(r.right for r in bird)
+    bt, bb = min(r.top for r in bird), max(r.bottom for r in bird)
+    v_min = config.flap_speed + config.gravity  # меньше после шага не бывает
+    step = config.pipe_speed
+    hit = (bl - pipe.right, br - pipe.left)
+    lowest_gap = config.height - config.gap_margin - config.pipe_gap
+    return Geometry(
+        dx_min=(hit[0] // step + 1) * step,
+        dx_max=math.ceil(config.spawn_distance / step) * step,
+        dx_step=step,
+        dy_min=-lowest_gap,
+        ny=config.height,
+        nv=int(round((v_max - v_min) / config.gravity)) + 1,
+        gap_span=lowest_gap - config.gap_margin,
+        bin_size=bin_size,
+        v_min=v_min,
+        gravity=config.gravity,
+        flap_speed=config.flap_speed,
+        pipe_gap=config.pipe_gap,
+        hit_dx=hit,
+        safe_dy=(-bt, config.pipe_gap - bb),
+    )
+
+
+def _solve(geo: Geometry, terminal=None, fallback=None):
+    """Все слои dx: (безопасность, решения) — списки массивов bool (nv, ny).
+
+    terminal — безопасные состояния в момент, когда труба позади (None —
+    любые на экране); fallback — решения для состояний без спасения.
+    """
+    import numpy as np
+
+    ny, nv = geo.ny, geo.nv
+    dys = np.arange(ny) + geo.dy_min
+    speeds = geo.v_min + (np.arange(nv) + 1) * geo.gravity
+    # Куда ведёт каждое действие: (dy, индекс скорости) следующего тика
+    fall = (np.floor(dys[None, :] + speeds[:, None]).astype(np.int64),
+            np.broadcast_to(np.arange(1, nv + 1)[:, None], (nv, ny)))
+    flap = (np.broadcast_to(np.floor(dys + geo.flap_speed + geo.gravity).astype(np.int64), (nv, ny)),
+            np.zeros((nv, ny), dtype=np.int64))
+    rescue = np.broadcast_to(dys > (geo.safe_dy[0] + geo.safe_dy[1]) // 2, (nv, ny))
+
+    safe_layers, decide_layers = [], []
+    prev = None
+    for layer in range(geo.layers):
+        nxt = geo.dx_min + (layer - 1) * geo.dx_step  # где будет труба при проверке столкновения
+        dangerous = geo.hit_dx[0] < nxt < geo.hit_dx[1]
+        target = terminal if nxt < geo.dx_min else prev
+
+        def ok(to_dy, to_v):
+            good = to_v < nv
+            vi = np.minimum(to_v, nv - 1)
+            # dy известен с точностью до пикселя: годиться должны обе клетки
+            for cell in (to_dy, to_dy + 1):
+                good = good & (cell >= geo.dy_min) & (cell < geo.dy_min + ny)
+                if dangerous:
+                    good &= (cell >= geo.safe_dy[0]) & (cell <= geo.safe_dy[1])
+                if target is not None:
+                    good &= target[vi, np.clip(cell - geo.dy_min, 0, ny - 1)]
+            return good
+
+        fall_ok = ok(*fall)
+        safe = fall_ok | ok(*flap)
+        # Спасения нет — решение запасной таблицы или хотя бы к середине зазора
+        decide = np.where(safe, ~fall_ok, rescue if fallback is None else fallback[layer])
+        safe_layers.append(safe)
+        decide_layers.append(decide)
+        prev = safe
+    return safe_layers, decide_layers
+
+
+def _next_pipe_safe(geo: Geometry, safe, lo: int, hi: int):
+    """Состояния, безопасные для следующей трубы при любой разнице зазоров из [lo, hi].
+
+    safe — безопасность относительно следующей трубы; её dy = наш dy - разница.
+    """
+    import numpy as np
+
+    ny = geo.ny
+    out = np.ones_like(safe)
+    for d in range(lo, hi + 1):
+        shifted = np.zeros_like(safe)
+        if d >= 0:
+            shifted[:, d:] = safe[:, :ny - d]
+        else:
+            shifted[:, :ny + d] = safe[:, -d:]
+        out &= shifted
+    return out
+
+
+def _bin_table(job) -> Tuple[int, bytes]:
+    """Биты решений для корзины b (выполняется в процессе пула)."""
+    import numpy as np
+
+    geo, b, exit_safe, fallback = job
+    lo = b * geo.bin_size - geo.gap_span
+    hi = min(lo + geo.bin_size - 1, geo.gap_span)
+    _, decide = _solve(geo, _next_pipe_safe(geo, exit_safe, lo, hi), fallback)
+    return b, np.packbits(np.stack(decide), bitorder="little").tobytes()
+
+
+def build(config: FlappyConfig, workers: Optional[int] = None) -> Tuple[Geometry, bytes]:
+    """Посчитать таблицы; биты решений идут подряд: корзины, затем «следующая не видна»."""
+    import numpy as np
+
+    geo = geometry(config)
+    safe, unseen = _solve(geo)
+    # Слой следующей трубы в тот тик, когда текущая перестаёт быть опасной
+    exit_layer = (geo.dx_max - geo.dx_step) // geo.dx_step
+    jobs = [(geo, b, safe[exit_layer], unseen) for b in range(geo.bins)]
+    tables = [b""] * geo.bins
+    with multiprocessing.Pool(workers) as pool:
+        for b, bits in pool.imap_unordered(_bin_table, jobs):
+            tables[b] = bits
+    tables.append(np.packbits(np.stack(unseen), bitorder="little").tobytes())
+    return geo, b"".join(tables)
+
+
+def save(path: str, geo: Geometry, bits: bytes) -> None:
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, *geo[:12]) + zlib.compress(bits, 9))
+
+
+class Autopilot:
+    """Готовая таблица: decide(sim) -> прыгать ли на следующем тике."""
+
+    def __init__(self, geo: Geometry, bits: bytes) -> None:
+        self.geo = geo
+        self.bits = bits
+        self.table_size = geo.layers * geo.nv * geo.ny
+
+    @classmethod
+    def load(cls, path: str = TABLE_FILE, config: Optional[FlappyConfig] = None) -> "Autopilot":
+        """Прочитать таблицу; ValueError, если она построена для другой физики."""
+        with open(path, "rb") as f:
+            data = f.read()
+        fields = HEADER.unpack_from(data)
+        if fields[0] != MAGIC or fields[1] != VERSION:
+            raise ValueError(f"{path}: не таблица автопилота")
+        geo = Geometry(*fields[2:])
+        cfg = config or FlappyConfig()
+        if (geo.dx_step, geo.gravity, geo.flap_speed, geo.pipe_gap, geo.gap_span) != (
+            cfg.pipe_speed, cfg.gravity, cfg.flap_speed, cfg.pipe_gap,
+            cfg.height - 2 * cfg.gap_margin - cfg.pipe_gap,
+        ):
+            raise ValueError(f"{path}: таблица построена для других параметров, пересоберите её")
+        return cls(geo, zlib.decompress(data[HEADER.size:]))
+
+    def decide(self, sim: FlappySim) -> bool:
+        geo = self.geo
+        bx = sim.config.bird_x
+        dx = gap_y = None
+        table = geo.bins  # «следующая не видна»
+        # Ближайшая труба, которая ещё может задеть птицу, и следующая за ней
+        for pipe_x, pipe_y, _ in sim.pipes.items(sim.scroll):
+            if int(pipe_x) - bx < geo.dx_min:
+                continue
+            if dx is not None:
+                table = geo.bin(gap_y, pipe_y)
+                break
+            dx, gap_y = min(int(pipe_x) - bx, geo.dx_max), pipe_y
+        if dx is None:
+            dx, gap_y = geo.dx_max, (sim.config.height - geo.pipe_gap) // 2
+        dy = int(sim.bird_y) - gap_y - geo.dy_min
+        if dy < 0:
+            return False
+        if dy >= geo.ny:
+            return True
+        vi = min(geo.nv - 1, max(0, int(round((sim.bird_speed - geo.v_min) / geo.gravity))))
+        i = table * self.table_size + (((dx - geo.dx_min) // geo.dx_step) * geo.nv + vi) * geo.ny + dy
+        return bool(self.bits[i >> 3] >> (i & 7) & 1)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Таблица автопилота для демо-режима")
+    sub = parser.add_subparsers(dest="command", required=True)
+    b = sub.add_parser("build", help="построить таблицу")
+    b.add_argument("--out", default=TABLE_FILE)
+    b.add_argument("--workers", type=int, default=None, help="число процессов (по умолчанию — все ядра)")
+    c = sub.add_parser("check", help="сыграть автопилотом без отрисовки")
+    c.add_argument("--table", default=TABLE_FILE)
+    c.add_argument("--games", type=int, default=10)
+    c.add_argument("--ticks", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        start = time.perf_counter()
+        geo, bits = build(FlappyConfig(), args.workers)
+        save(args.out, geo, bits)
+        print(f"{args.out}: {geo.bins + 1} таблиц, {len(bits)} -> {os.path.getsize(args.out)} байт, "
+              f"{time.perf_counter() - start:.1f} с")
+        return 0
+
+    start = time.perf_counter()
+    pilot = Autopilot.load(args.table)
+    print(f"загрузка таблицы: {(time.perf_counter() - start) * 1000:.1f} мс")
+    sim = FlappySim()
+    failed = total = 0
+    for seed in range(args.games):
+        sim.reset(seed)
+        while sim.tick < args.ticks and sim.step(pilot.decide(sim)):
+            pass
+        failed += not sim.alive
+        total += sim.score
+        print(f"seed {seed}: счёт {sim.score}, тиков {sim.tick}{'' if sim.alive else ' (разбился)'}")
+    print(f"разбился в {failed} из {args.games}, средний счёт {total / max(1, args.games):.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
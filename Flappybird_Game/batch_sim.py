@@ -0,0 +1,144 @@
+"""Пакетная симуляция: N птиц на общем потоке труб, шаг векторизован NumPy.
+
+Правила те же, что у sim.FlappySim: птица i при тех же seed и нажатиях
+получает тот же счёт, что и одиночная симуляция.
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from course import Course
+from pipes import PipeRing
+from sim import BIRD_SIZES, PIPE_SIZE, FlappyConfig
+
+
+class BatchSim:
+    """N птиц в массивах NumPy; трубы общие для всех."""
+
+    def __init__(
+        self,
+        n: int,
+        config: Optional[FlappyConfig] = None,
+        bird_sizes: Tuple[Tuple[int, int], ...] = BIRD_SIZES,
+        pipe_size: Tuple[int, int] = PIPE_SIZE,
+        masks=None,
+    ) -> None:
+        self.n = n
+        self.config = config or FlappyConfig()
+        self.masks = None
+        self._columns: dict = {}
+        if self.config.pixel_collision:
+            from collision import default_masks
+
+            self.masks = masks or default_masks()
+            bird_sizes, pipe_size = self.masks.bird_sizes, self.masks.pipe_size
+        self.bird_sizes = bird_sizes
+        self.pipe_width, self.pipe_height = pipe_size
+        self.pipes = PipeRing(self.config.pipe_capacity(self.pipe_width))
+        self.reset()
+
+    def reset(self, seed: Optional[int] = None) -> None:
+        """Вернуть всех птиц на старт и начать новый поток труб."""
+        cfg = self.config
+        self.seed = seed
+        self.course = Course(seed, cfg)
+        self.spawned = 0
+        self.tick = 0
+        # Анимация у всех птиц идёт синхронно, поэтому индекс кадра общий
+        self.bird_index: float = 0
+        self.bird_y = np.full(self.n, float(cfg.height // 2))
+        self.bird_speed = np.zeros(self.n)
+        self.alive = np.ones(self.n, dtype=bool)
+        self.score = np.zeros(self.n, dtype=np.int64)
+        # Тик гибели (0 — ещё жива), для кривых выживания
+        self.death_tick = np.zeros(self.n, dtype=np.int64)
+        self.scroll: float = 0
+        self.next_spawn: float = cfg.spawn_distance
+        self.pipes.clear()
+
+    def spawn_pipe(self) -> None:
+        self.pipes.push(self.scroll + self.config.width, self.course.gap(self.spawned))
+        self.spawned += 1
+
+    def iter_pipes(self):
+        """(экранная x, y зазора, пройдена) для труб на экране, слева направо."""
+        return self.pipes.items(self.scroll)
+
+    def _mask_hits(self, frame: int, dx: int, pipe_y: int, by: np.ndarray, top: bool) -> np.ndarray:
+        """Попадание по маскам для всех птиц сразу: выборка из профиля collision.column()."""
+        key = (frame, dx, top)
+        col = self._columns.get(key)
+        if col is None:
+            col = np.frombuffer(self.masks.column(frame, dx, top), dtype=np.uint8).astype(bool)
+            self._columns[key] = col
+        dy = pipe_y - by
+        ph = self.pipe_height
+        inside = (dy > -ph) & (dy < len(col) - ph + 1)
+        return inside & col[np.clip(dy + ph - 1, 0, len(col) - 1)]
+
+    def step(self, flap) -> np.ndarray:
+        """Один кадр для всех живых птиц; flap — bool или массив из n значений."""
+        cfg = self.config
+        live = self.alive.copy()
+        if not live.any():
+            return self.alive
+        self.tick += 1
+        flap = np.broadcast_to(np.asarray(flap, dtype=bool), (self.n,))
+        if self.scroll + cfg.pipe_speed >= self.next_spawn:
+            self.spawn_pipe()
+            self.next_spawn += cfg.spawn_distance
+
+        # Гравитация и прыжок — только для живых, мёртвые остаются на месте
+        self.bird_speed = np.where(live & flap, cfg.flap_speed, self.bird_speed)
+        self.bird_speed[live] += cfg.gravity
+        self.bird_y[live] += self.bird_speed[live]
+        self.bird_index += cfg.anim_step
+        if self.bird_index >= len(self.bird_sizes):
+            self.bird_index = 0
+        hit = self.bird_y > cfg.height
+
+        bird_w, bird_h = self.bird_sizes[int(self.bird_index)]
+        bx = cfg.bird_x
+        pw, ph = self.pipe_width, self.pipe_height
+        ring = self.pipes
+        self.scroll += cfg.pipe_speed
+        ring.drop_before(self.scroll - pw)
+
+        by = self.bird_y.astype(np.int64)  # усечение, как у pygame.Rect
+        gained = 0
+        for slot in ring.slots():
+            x = ring.world_x[slot] - self.scroll
+            if x >= bx + bird_w:
+                break
+            px = int(x)
+            top_y = ring.gap_y[slot] - ph
+            bottom_y = ring.gap_y[slot] + cfg.pipe_gap
+            # По X все птицы одинаковы: проверка по Y нужна лишь при перекрытии
+            if self.masks is not None:
+                if bx < px + pw:
+                    frame = int(self.bird_index)
+                    hit |= self._mask_hits(frame, px - bx, top_y, by, True)
+                    hit |= self._mask_hits(frame, px - bx, bottom_y, by, False)
+            elif bx < px + pw - 5:
+                hit |= (by < top_y + ph - 5) & (top_y < by + bird_h)
+                hit |= (by < bottom_y + ph - 5) & (bottom_y < by + bird_h)
+            if x + pw < bx and not ring.is_passed(slot):
+                ring.mark_passed(slot)
+                gained += 1
+
+        if gained:
+            self.score[live] += gained
+        died = live & hit
+        self.alive &= ~died
+        self.death_tick[died] = self.tick
+        return self.alive
+
+    def run(self, policy, max_ticks: int) -> np.ndarray:
+        """Играть, пока все не погибнут или не истечёт max_ticks; policy(sim) -> массив нажатий."""
+        while self.tick < max_ticks and self.alive.any():
+            self.step(policy(self))
+        self.death_tick[self.alive] = self.tick
+        return self.score
@@ -0,0 +1,289 @@
+"""Сборка облегчённого набора файлов для веб-версии (pygbag).
+
+1. От main.py по import'ам находит модули игры, в их исходниках — имена
+   реально используемых файлов (картинки, records.txt). Остальные картинки
+   репозитория в сборку не попадают.
+2. PNG пережимаются: вырезаются служебные чанки (iTXt, pHYs, eXIf, ...),
+   строки заново фильтруются, IDAT сжимается zlib -9; берётся меньший вариант.
+3. Пишется assets_manifest.json: first_frame — что нужно до появления меню
+   (код и records.txt), lazy — что подгружается после (assets.py).
+
+   build/web-stage/  — папка для `pygbag build/web-stage` (только first_frame)
+   build/web/lazy/   — ленивые файлы рядом с index.html
+
+    python build_web.py
+    python build_web.py --measure --kbps 2000   # замер загрузки с локального HTTP-сервера
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import functools
+import hashlib
+import http.server
+import json
+import os
+import re
+import shutil
+import struct
+import sys
+import threading
+import time
+import urllib.request
+import zlib
+from typing import Dict, List, Optional, Set
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ASSET_RE = re.compile(r"\.(png|jpe?g|gif|bmp|txt|wav|ogg|mp3|ttf|bin)$", re.IGNORECASE)
+# Нужны уже на первом кадре, даже если это не код
+FIRST_FRAME_ASSETS = {"records.txt"}
+KEEP_CHUNKS = {b"IHDR", b"PLTE", b"tRNS", b"IDAT", b"IEND"}
+CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+
+def local_modules(entry: str = "main.py") -> List[str]:
+    """Файлы .py этой папки, достижимые import'ами из entry."""
+    found: List[str] = []
+    queue = [entry]
+    while queue:
+        name = queue.pop()
+        if name in found:
+            continue
+        found.append(name)
+        with open(os.path.join(HERE, name), encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                mods = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                mods = [node.module]
+            else:
+                continue
+            for mod in mods:
+                path = mod.split(".")[0] + ".py"
+                if os.path.exists(os.path.join(HERE, path)):
+                    queue.append(path)
+    return sorted(found)
+
+
+def referenced_assets(modules: List[str]) -> List[str]:
+    """Строковые литералы модулей, совпадающие с файлами этой папки."""
+    names: Set[str] = set()
+    for module in modules:
+        with open(os.path.join(HERE, module), encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Constant) and isinstance(node.value, str) and ASSET_RE.search(node.value):
+                if os.path.isfile(os.path.join(HERE, node.value)):
+                    names.add(node.value)
+    return sorted(names)
+
+
+def _paeth(a: int, b: int, c: int) -> int:
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    return b if pb <= pc else c
+
+
+def _unfilter(data: bytes, width: int, height: int, bpp: int) -> List[bytearray]:
+    stride = width * bpp
+    rows: List[bytearray] = []
+    prev = bytearray(stride)
+    pos = 0
+    for _ in range(height):
+        ftype = data[pos]
+        row = bytearray(data[pos + 1: pos + 1 + stride])
+        pos += 1 + stride
+        for i in range(stride):
+            a = row[i - bpp] if i >= bpp else 0
+            b = prev[i]
+            c = prev[i - bpp] if i >= bpp else 0
+            if ftype == 1:
+                row[i] = (row[i] + a) & 0xFF
+            elif ftype == 2:
+                row[i] = (row[i] + b) & 0xFF
+            elif ftype == 3:
+                row[i] = (row[i] + ((a + b) >> 1)) & 0xFF
+            elif ftype == 4:
+                row[i] = (row[i] + _paeth(a, b, c)) & 0xFF
+        rows.append(row)
+        prev = row
+    return rows
+
+
+def _filter_row(ftype: int, row: bytearray, prev: bytearray, bpp: int) -> bytes:
+    if ftype == 0:
+        return bytes(row)
+    out = bytearray(len(row))
+    for i in range(len(row)):
+        a = row[i - bpp] if i >= bpp else 0
+        b = prev[i]
+        c = prev[i - bpp] if i >= bpp else 0
+        pred = (a, b, (a + b) >> 1, _paeth(a, b, c))[ftype - 1]
+        out[i] = (row[i] - pred) & 0xFF
+    return bytes(out)
+
+
+def _refilter(rows: List[bytearray], bpp: int) -> List[bytes]:
+    """Кандидаты: один фильтр на все строки и адаптивный (минимум суммы модулей)."""
+    stride = len(rows[0]) if rows else 0
+    filtered = {}
+    for ftype in range(5):
+        prev = bytearray(stride)
+        out = []
+        for row in rows:
+            out.append(_filter_row(ftype, row, prev, bpp))
+            prev = row
+        filtered[ftype] = out
+    candidates = [b"".join(bytes([f]) + r for r in filtered[f]) for f in range(5)]
+
+    def cost(line: bytes) -> int:
+        return sum(v if v < 128 else 256 - v for v in line)
+
+    adaptive = []
+    for i in range(len(rows)):
+        best = min(range(5), key=lambda f: cost(filtered[f][i]))
+        adaptive.append(bytes([best]) + filtered[best][i])
+    candidates.append(b"".join(adaptive))
+    return candidates
+
+
+def _chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def optimize_png(data: bytes) -> bytes:
+    """Без потерь: убрать служебные чанки и пережать пиксели. Возвращает меньший вариант."""
+    if data[:8] != b"\x89PNG\r\n\x1a\n":
+        return data
+    chunks = []
+    idat = bytearray()
+    pos = 8
+    while pos < len(data):
+        (size,) = struct.unpack(">I", data[pos: pos + 4])
+        kind = data[pos + 4: pos + 8]
+        body = data[pos + 8: pos + 8 + size]
+        pos += 12 + size
+        if kind == b"IDAT":
+            idat += body
+        elif kind in KEEP_CHUNKS:
+            chunks.append((kind, body))
+    width, height, depth, color, _, _, interlace = struct.unpack(">IIBBBBB", chunks[0][1])
+    raw = zlib.decompress(bytes(idat))
+    candidates = [raw]
+    if depth == 8 and interlace == 0 and color in CHANNELS:
+        rows = _unfilter(raw, width, height, CHANNELS[color])
+        candidates += _refilter(rows, CHANNELS[color])
+    best_idat = min((zlib.compress(c, 9) for c in candidates), key=len)
+
+    out = bytearray(data[:8])
+    for kind, body in chunks:
+        if kind == b"IEND":
+            out += _chunk(b"IDAT", best_idat)
+        out += _chunk(kind, body)
+    return bytes(out) if len(out) < len(data) else data
+
+
+def _entry(directory: str, name: str) -> Dict[str, object]:
+    with open(os.path.join(directory, name), "rb") as f:
+        data = f.read()
+    return {"name": name, "size": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+
+
+def build(stage: str, lazy_dir: str) -> Dict[str, object]:
+    modules = local_modules()
+    assets = referenced_assets(modules)
+    for directory in (stage, lazy_dir):
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+
+    first = list(modules)
+    lazy = []
+    for name in assets:
+        target_dir = stage if name in FIRST_FRAME_ASSETS else lazy_dir
+        (first if name in FIRST_FRAME_ASSETS else lazy).append(name)
+        with open(os.path.join(HERE, name), "rb") as f:
+            data = f.read()
+        if name.lower().endswith(".png"):
+            data = optimize_png(data)
+        with open(os.path.join(target_dir, name), "wb") as f:
+            f.write(data)
+    for name in modules:
+        shutil.copy2(os.path.join(HERE, name), os.path.join(stage, name))
+
+    manifest = {
+        "first_frame": [_entry(stage, n) for n in first],
+        "lazy": [_entry(lazy_dir, n) for n in lazy],
+    }
+    with open(os.path.join(stage, "assets_manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    return manifest
+
+
+class _ThrottledHandler(http.server.SimpleHTTPRequestHandler):
+    kbps = 0  # 0 — без ограничения
+
+    def copyfile(self, source, outputfile):
+        if not self.kbps:
+            return super().copyfile(source, outputfile)
+        chunk = max(1024, self.kbps * 1000 // 8 // 20)  # порции по 50 мс
+        while True:
+            buf = source.read(chunk)
+            if not buf:
+                return
+            outputfile.write(buf)
+            time.sleep(len(buf) * 8 / (self.kbps * 1000))
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def measure(web_dir: str, first: List[str], lazy: List[str], kbps: int) -> None:
+    """Скачать файлы с локального сервера и напечатать время «до меню» и полной загрузки."""
+    handler = functools.partial(_ThrottledHandler, directory=web_dir)
+    _ThrottledHandler.kbps = kbps
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    def fetch(names: List[str]) -> tuple:
+        start = time.perf_counter()
+        total = 0
+        for name in names:
+            with urllib.request.urlopen(base + name) as response:
+                total += len(response.read())
+        return total, time.perf_counter() - start
+
+    try:
+        size, elapsed = fetch(first)
+        print(f"до первого кадра: {size} байт за {elapsed * 1000:.0f} мс ({', '.join(first)})")
+        if lazy:
+            size, elapsed = fetch(lazy)
+            print(f"ленивые файлы:    {size} байт за {elapsed * 1000:.0f} мс")
+    finally:
+        server.shutdown()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stage", default=os.path.join(HERE, "build", "web-stage"))
+    parser.add_argument("--web", default=os.path.join(HERE, "build", "web"), help="папка с index.html")
+    parser.add_argument("--measure", action="store_true", help="замерить загрузку с локального сервера")
+    parser.add_argument("--kbps", type=int, default=0, help="ограничение скорости сервера, кбит/с")
+    args = parser.parse_args(argv)
+
+    manifest = build(args.stage, os.path.join(args.web, "lazy"))
+    for part in ("first_frame", "lazy"):
+        entries = manifest[part]
+        print(f"{part}: {len(entries)} файлов, {sum(e['size'] for e in entries)} байт")
+    if args.measure:
+        first = ["index.html"] + [n for n in os.listdir(args.web) if n.endswith(".apk")]
+        measure(args.web, first, ["lazy/" + e["name"] for e in manifest["lazy"]], args.kbps)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""Точные столкновения птицы с трубами по маскам pygame.mask.
+
+Маски строятся один раз: по одной на кадр анимации птицы и по одной на
+обычную и перевёрнутую трубу. Сначала дешёвая проверка прямоугольников,
+Mask.overlap — только если они пересекаются.
+
+Изображения грузятся без дисплея, так что маски доступны и безоконной
+симуляции (sim.FlappySim, batch_sim.BatchSim, проверка реплеев).
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Dict, Optional, Sequence, Tuple
+
+import pygame
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BIRD_FILES = ("Bird4.png", "Bird5.png", "Bird8.png")
+PIPE_FILE = "pipe_ts.png"
+
+
+class CollisionMasks:
+    """Маски кадров птицы и труб с кэшем «профилей» для пакетной проверки."""
+
+    def __init__(self, bird_surfaces: Sequence[pygame.Surface], pipe_surface: pygame.Surface) -> None:
+        self.bird = [pygame.mask.from_surface(s) for s in bird_surfaces]
+        self.bird_sizes: Tuple[Tuple[int, int], ...] = tuple(s.get_size() for s in bird_surfaces)
+        self.pipe_bottom = pygame.mask.from_surface(pipe_surface)
+        self.pipe_top = pygame.mask.from_surface(pygame.transform.flip(pipe_surface, False, True))
+        self.pipe_size: Tuple[int, int] = pipe_surface.get_size()
+        self._columns: Dict[Tuple[int, int, bool], bytes] = {}
+
+    def hits(self, frame: int, bx: int, by: int, px: int, top_y: int, bottom_y: int) -> bool:
+        """Касается ли кадр frame птицы в (bx, by) верхней трубы в (px, top_y) или нижней в (px, bottom_y)."""
+        bw, bh = self.bird_sizes[frame]
+        pw, ph = self.pipe_size
+        if not (bx < px + pw and px < bx + bw):
+            return False
+        mask = self.bird[frame]
+        if by < top_y + ph and top_y < by + bh and mask.overlap(self.pipe_top, (px - bx, top_y - by)):
+            return True
+        if by < bottom_y + ph and bottom_y < by + bh and mask.overlap(self.pipe_bottom, (px - bx, bottom_y - by)):
+            return True
+        return False
+
+    def column(self, frame: int, dx: int, top: bool) -> bytes:
+        """Столкновения при фиксированном сдвиге трубы по x (dx = px - bx) для всех сдвигов по y.
+
+        Байт с индексом dy + высота_трубы - 1 равен 1, если при pipe_y - bird_y == dy
+        маски пересекаются. Для BatchSim: все птицы стоят на одном x, поэтому
+        проверка стаи сводится к выборке по этой таблице.
+        """
+        key = (frame, dx, top)
+        col = self._columns.get(key)
+        if col is None:
+            bh = self.bird_sizes[frame][1]
+            ph = self.pipe_size[1]
+            mask = self.bird[frame]
+            pipe = self.pipe_top if top else self.pipe_bottom
+            col = bytes(
+                1 if mask.overlap(pipe, (dx, dy)) else 0 for dy in range(-(ph - 1), bh)
+            )
+            self._columns[key] = col
+        return col
+
+
+_default: Optional[CollisionMasks] = None
+
+
+def default_masks() -> CollisionMasks:
+    """Маски из картинок игры (загружаются один раз на процесс)."""
+    global _default
+    if _default is None:
+        birds = [pygame.image.load(os.path.join(HERE, name)) for name in BIRD_FILES]
+        pipe = pygame.image.load(os.path.join(HERE, PIPE_FILE))
+        _default = CollisionMasks(birds, pipe)
+    return _default
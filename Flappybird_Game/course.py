@@ -0,0 +1,93 @@
+"""Трасса: последовательность зазоров труб, полностью заданная seed'ом.
+
+Зазоры генерируются тем же random.Random(seed).randint, что и раньше в
+симуляции, но заранее, блоками по chunk штук в компактный array('H').
+Труба i — это gap(i): обращение к массиву, блоки досчитываются по мере
+надобности. Поэтому у всех игроков и всех прогонов с одним seed трасса
+одинакова, а её отпечаток (digest) можно сверить без симуляции.
+
+Ежедневная трасса: daily_seed() выводит seed из даты, так что все
+автоматы в один день играют одно и то же.
+
+    python course.py --daily
+    python course.py --seed 42 --count 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import hashlib
+import random
+import sys
+from array import array
+from typing import List, Optional
+
+
+def daily_seed(day: Optional[datetime.date] = None, salt: str = "flappy") -> int:
+    """32-битный seed ежедневной трассы (по UTC-дате)."""
+    day = day or datetime.datetime.now(datetime.timezone.utc).date()
+    digest = hashlib.sha256(f"{salt}:{day.isoformat()}".encode()).digest()
+    return int.from_bytes(digest[:4], "little")
+
+
+class Course:
+    """Зазоры труб для seed; gap(i) — y верхнего края зазора i-й трубы."""
+
+    def __init__(self, seed: Optional[int], config, chunk: int = 256) -> None:
+        """config — sim.FlappyConfig (нужны height, gap_margin, pipe_gap)."""
+        self.seed = seed
+        self.chunk = chunk
+        self.low = config.gap_margin
+        self.high = config.height - config.gap_margin - config.pipe_gap
+        self._rng = random.Random(seed)
+        self.gaps = array("H")
+
+    def __len__(self) -> int:
+        """Сколько зазоров уже сгенерировано."""
+        return len(self.gaps)
+
+    def _extend(self, n: int) -> None:
+        """Догенерировать блоки, пока зазоров не станет хотя бы n."""
+        randint, low, high = self._rng.randint, self.low, self.high
+        while len(self.gaps) < n:
+            self.gaps.extend(randint(low, high) for _ in range(self.chunk))
+
+    def gap(self, i: int) -> int:
+        if i >= len(self.gaps):
+            self._extend(i + 1)
+        return self.gaps[i]
+
+    def prefix(self, n: int) -> array:
+        """Первые n зазоров."""
+        self._extend(n)
+        return self.gaps[:n]
+
+    def digest(self, n: int) -> str:
+        """Отпечаток первых n зазоров — сверить трассу между автоматами."""
+        return hashlib.sha256(self.prefix(n).tobytes()).hexdigest()[:16]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--daily", action="store_true", help="трасса на сегодня")
+    parser.add_argument("--date", help="трасса на дату ГГГГ-ММ-ДД")
+    parser.add_argument("--count", type=int, default=10, help="сколько зазоров напечатать")
+    args = parser.parse_args(argv)
+    if args.date:
+        seed = daily_seed(datetime.date.fromisoformat(args.date))
+    elif args.daily or args.seed is None:
+        seed = daily_seed()
+    else:
+        seed = args.seed
+    from sim import FlappyConfig
+
+    course = Course(seed, FlappyConfig())
+    print(f"seed {seed}, отпечаток первых 1000: {course.digest(1000)}")
+    print(" ".join(str(g) for g in course.prefix(args.count)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
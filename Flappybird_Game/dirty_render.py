@@ -0,0 +1,109 @@
+"""Отрисовка кадра: полная (fill + flip) или по «грязным» прямоугольникам.
+
+Оба рендерера имеют один интерфейс: begin(), blit(), fill_rect(), present().
+DirtyRenderer не рисует сразу, а запоминает команды кадра и в present()
+сравнивает их с прошлым кадром: перерисовываются (из кэша фона) только
+области, где элемент появился, исчез, сдвинулся или сменился, и на экран
+отправляются только они — pygame.display.update(rects). Неизменный экран
+меню/рекордов/Game Over не стоит почти ничего.
+"""
+
+from __future__ import annotations
+
+from typing import Hashable, List, Optional, Tuple
+
+import pygame
+
+Color = Tuple[int, int, int]
+
+
+class FullRenderer:
+    """Обычный режим: заливка всего окна и display.flip() каждый кадр."""
+
+    def __init__(self, screen: pygame.Surface, background: Color) -> None:
+        self.screen = screen
+        self.background = background
+
+    def begin(self) -> None:
+        self.screen.fill(self.background)
+
+    def blit(self, surface: pygame.Surface, pos, key: Optional[Hashable] = None) -> pygame.Rect:
+        return self.screen.blit(surface, pos)
+
+    def fill_rect(self, color: Color, rect: pygame.Rect, key: Optional[Hashable] = None) -> pygame.Rect:
+        return pygame.draw.rect(self.screen, color, rect)
+
+    def invalidate(self) -> None:
+        pass
+
+    def present(self) -> None:
+        pygame.display.flip()
+
+
+class DirtyRenderer:
+    """Режим грязных прямоугольников поверх закэшированного фона.
+
+    key — признак содержимого элемента: поверхности, которые создаются
+    заново каждый кадр (текст, перевёрнутая труба), должны передавать
+    стабильный key, иначе элемент будет считаться изменённым.
+    """
+
+    def __init__(self, screen: pygame.Surface, background: Color) -> None:
+        self.screen = screen
+        self.background = pygame.Surface(screen.get_size()).convert(screen)
+        self.background.fill(background)
+        self._prev: List[tuple] = []
+        self._cur: List[tuple] = []
+        self._full = True
+
+    def begin(self) -> None:
+        self._cur = []
+
+    def blit(self, surface: pygame.Surface, pos, key: Optional[Hashable] = None) -> pygame.Rect:
+        rect = surface.get_rect(topleft=(int(pos[0]), int(pos[1])))
+        self._cur.append((key if key is not None else id(surface), tuple(rect), surface))
+        return rect
+
+    def fill_rect(self, color: Color, rect: pygame.Rect, key: Optional[Hashable] = None) -> pygame.Rect:
+        rect = pygame.Rect(rect)
+        self._cur.append((("rect", color) if key is None else key, tuple(rect), color))
+        return rect
+
+    def invalidate(self) -> None:
+        """Перерисовать весь экран в следующем present() (например, после смены окна)."""
+        self._full = True
+
+    def _dirty_rects(self) -> List[pygame.Rect]:
+        if self._full:
+            return [self.screen.get_rect()]
+        prev = {cmd[:2] for cmd in self._prev}
+        cur = {cmd[:2] for cmd in self._cur}
+        rects = [pygame.Rect(r) for _, r in prev ^ cur]
+        # Сливаем пересекающиеся области, чтобы не перерисовывать их дважды
+        merged: List[pygame.Rect] = []
+        for rect in rects:
+            i = rect.collidelist(merged)
+            while i != -1:
+                rect.union_ip(merged.pop(i))
+                i = rect.collidelist(merged)
+            merged.append(rect)
+        bounds = self.screen.get_rect()
+        return [r.clip(bounds) for r in merged if r.colliderect(bounds)]
+
+    def present(self) -> None:
+        dirty = self._dirty_rects()
+        self._full = False
+        screen = self.screen
+        for area in dirty:
+            screen.set_clip(area)
+            screen.blit(self.background, area, area)
+            for key, rect, item in self._cur:
+                if area.colliderect(rect):
+                    if isinstance(item, pygame.Surface):
+                        screen.blit(item, rect)
+                    else:
+                        pygame.draw.rect(screen, item, rect)
+        screen.set_clip(None)
+        self._prev = self._cur
+        if dirty:
+            pygame.display.update(dirty)
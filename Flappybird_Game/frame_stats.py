@@ -0,0 +1,78 @@
+"""Статистика кадров: интервалы между кадрами и время работы самого кадра.
+
+Интервал (pacing) показывает, насколько ровно приходят кадры — в браузере
+его задаёт requestAnimationFrame, на десктопе clock.tick(). Время работы —
+сколько кадр занял до отдачи управления (await / tick). Хранятся последние
+window значений.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+
+def _percentile(ordered, pct: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class FrameStats:
+    """Скользящее окно интервалов и рабочего времени кадров, в миллисекундах."""
+
+    def __init__(self, target_fps: int = 60, window: int = 3600) -> None:
+        self.target_ms = 1000 / target_fps if target_fps else 0.0
+        self.intervals: Deque[float] = deque(maxlen=window)
+        self.work: Deque[float] = deque(maxlen=window)
+        self.frames = 0
+        self._last: Optional[float] = None
+        self._begin: Optional[float] = None
+
+    def begin_frame(self) -> None:
+        now = time.perf_counter()
+        if self._last is not None:
+            self.intervals.append((now - self._last) * 1000)
+        self._last = self._begin = now
+
+    def end_frame(self) -> None:
+        """Конец работы кадра — перед await/tick."""
+        if self._begin is not None:
+            self.work.append((time.perf_counter() - self._begin) * 1000)
+            self.frames += 1
+
+    @staticmethod
+    def _describe(values, budget: float) -> Dict[str, float]:
+        ordered = sorted(values)
+        n = len(ordered)
+        return {
+            "mean": sum(ordered) / n if n else 0.0,
+            "p50": _percentile(ordered, 50),
+            "p95": _percentile(ordered, 95),
+            "p99": _percentile(ordered, 99),
+            "max": ordered[-1] if n else 0.0,
+            # Сколько кадров заметно не уложилось в бюджет
+            "late": sum(1 for v in ordered if budget and v > budget * 1.5),
+        }
+
+    def summary(self) -> Dict[str, object]:
+        interval = self._describe(self.intervals, self.target_ms)
+        return {
+            "frames": self.frames,
+            "fps": 1000 / interval["mean"] if interval["mean"] else 0.0,
+            "interval_ms": interval,
+            "work_ms": self._describe(self.work, self.target_ms),
+        }
+
+    def format(self) -> str:
+        s = self.summary()
+        i, w = s["interval_ms"], s["work_ms"]
+        return (f"кадров {s['frames']}, {s['fps']:.1f} FPS; интервал mean {i['mean']:.2f} "
+                f"p95 {i['p95']:.2f} p99 {i['p99']:.2f} мс, опоздало {i['late']}; "
+                f"работа mean {w['mean']:.2f} p99 {w['p99']:.2f} мс")
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=1)
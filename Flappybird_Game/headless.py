@@ -0,0 +1,69 @@
+"""Безоконный прогон main.main() на локальном цикле asyncio.
+
+Окно подменяется драйвером SDL "dummy", время — фиксированным шагом кадра,
+ввод — сценарием: {номер кадра: [события]}. Удобно, чтобы проверить игру
+без экрана и сравнить темп кадров с браузерной сборкой.
+
+    python headless.py --frames 600
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+from typing import Callable, Dict, List, Optional
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+import main as game  # noqa: E402
+from sim import FlappyConfig  # noqa: E402
+
+
+def demo_script(frames: int, flap_every: int = 18) -> Dict[int, List[pygame.event.Event]]:
+    """Нажать «Start game», затем прыгать каждые flap_every кадров."""
+    script: Dict[int, List[pygame.event.Event]] = {
+        2: [pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(600, 240), button=1)]
+    }
+    for f in range(3, frames, flap_every):
+        script.setdefault(f, []).append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+    return script
+
+
+def run(
+    frames: int,
+    script: Dict[int, List[pygame.event.Event]],
+    frame_ms: Optional[float] = 1000 / 60,
+    config: Optional[FlappyConfig] = None,
+    on_frame: Optional[Callable[[int], None]] = None,
+):
+    """Прогнать игру frames кадров, подавая события из script; возвращает FrameStats.
+
+    on_frame(номер) вызывается в начале каждого кадра после подачи событий
+    (например, для замеров, см. benchmarks/bench.py).
+    """
+
+    def feed(frame: int) -> None:
+        for event in script.get(frame, ()):
+            pygame.event.post(event)
+        if on_frame is not None:
+            on_frame(frame)
+
+    return asyncio.run(game.main(max_frames=frames, on_frame=feed, frame_ms=frame_ms, config=config))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--real-time", action="store_true", help="считать время по часам, а не шагом 1/60 с")
+    args = parser.parse_args(argv)
+    run(args.frames, demo_script(args.frames), None if args.real_time else 1000 / 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
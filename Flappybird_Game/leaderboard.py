@@ -0,0 +1,168 @@
+"""Таблица рекордов в памяти с фоновым сохранением в records.txt.
+
+Файл читается один раз; top() отвечает из памяти. submit() только кладёт
+результат в очередь — запись идёт в фоновом потоке: серия результатов,
+пришедших подряд, сохраняется одной записью. При сохранении файл
+блокируется, перечитывается и объединяется с новыми результатами, затем
+пишется во временный файл и атомарно подменяется (os.replace), так что
+несколько запущенных игр не теряют и не портят рекорды друг друга.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+Record = Tuple[str, int]
+
+
+def parse_records(lines) -> List[Record]:
+    """Строки «имя,очки»; запятая в имени допустима, битые строки пропускаются."""
+    records = []
+    for line in lines:
+        name, sep, score = line.strip().rpartition(",")
+        if sep and score.strip().lstrip("-").isdigit():
+            records.append((name, int(score)))
+    return records
+
+
+def read_records(path: str) -> List[Record]:
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return parse_records(f)
+
+
+class _FileLock:
+    """Межпроцессная блокировка через отдельный .lock-файл."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path + ".lock"
+        self.fd: Optional[int] = None
+
+    def __enter__(self) -> "_FileLock":
+        self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(self.fd, msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if fcntl is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(self.fd, 0, os.SEEK_SET)
+            msvcrt.locking(self.fd, msvcrt.LK_UNLCK, 1)
+        os.close(self.fd)
+        self.fd = None
+
+
+class Leaderboard:
+    """Рекорды в памяти; сохранение — в фоне, пакетами, атомарно."""
+
+    def __init__(
+        self,
+        path: str = "records.txt",
+        limit: int = 5,
+        delay: float = 0.5,
+        background: Optional[bool] = None,
+    ) -> None:
+        self.path = path
+        self.limit = limit
+        self.delay = delay  # сколько ждать, собирая результаты в одну запись
+        # В браузере (pygbag) потоков нет — там пишем сразу
+        self.background = sys.platform != "emscripten" if background is None else background
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._pending: List[Record] = []
+        self._closed = False
+        self._records = self._trim(read_records(path))
+        self._thread: Optional[threading.Thread] = None
+        if self.background:
+            self._thread = threading.Thread(target=self._writer, name="leaderboard-writer", daemon=True)
+            self._thread.start()
+
+    def _trim(self, records: List[Record]) -> List[Record]:
+        records.sort(key=lambda x: x[1], reverse=True)
+        return records[: self.limit]
+
+    def top(self, n: Optional[int] = None) -> List[Record]:
+        """Лучшие n результатов (по умолчанию — все хранимые)."""
+        with self._lock:
+            return self._records[: self.limit if n is None else n]
+
+    def submit(self, name: str, score: int) -> None:
+        """Добавить результат; на диск он попадёт в фоне."""
+        record = (name.replace("\n", " "), int(score))
+        with self._lock:
+            self._records = self._trim(self._records + [record])
+            self._pending.append(record)
+            self._wake.notify()
+        if not self.background:
+            self.flush()
+
+    def flush(self) -> None:
+        """Записать накопленные результаты прямо сейчас (в вызывающем потоке)."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if pending:
+            self._persist(pending)
+
+    def close(self) -> None:
+        """Дописать всё и остановить фоновый поток."""
+        with self._lock:
+            self._closed = True
+            self._wake.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _writer(self) -> None:
+        while True:
+            with self._lock:
+                while not self._pending and not self._closed:
+                    self._wake.wait()
+                if self._closed:
+                    return
+                # Даём серии результатов собраться, затем пишем их разом. submit()
+                # будит поток, поэтому ждём до срока, а раньше выходим только по close()
+                deadline = time.monotonic() + self.delay
+                while not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._wake.wait(remaining)
+                pending, self._pending = self._pending, []
+            if pending:
+                self._persist(pending)
+
+    def _persist(self, pending: List[Record]) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        with _FileLock(self.path):
+            merged = self._trim(read_records(self.path) + pending)
+            fd, tmp = tempfile.mkstemp(prefix=".records-", dir=directory)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    for name, score in merged:
+                        f.write(f"{name},{score}\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        # Подтягиваем рекорды, сохранённые другими процессами
+        with self._lock:
+            self._records = self._trim(merged + self._pending)
@@ -1,181 +1,348 @@
+import asyncio
 import sys
 import pygame
 import random
 import os
+import time
+
+import assets
+from collision import CollisionMasks
+from course import daily_seed
+from dirty_render import DirtyRenderer, FullRenderer
+from frame_stats import FrameStats
+from leaderboard import Leaderboard
+from phase_profiler import PhaseProfiler
+from replay import ReplayRecorder, save as save_replay
+from sim import FlappyConfig, FlappySim
+from transform_cache import default_cache
+from text_cache import GlyphAtlas, default_text_cache
+from trace_capture import default_tracer, traced
+from ui import Button, CounterLabel, Label, ScoreList
 
 def resource_path(relative):
     if hasattr(sys, "_MEIPASS"):
         return os.path.join(sys._MEIPASS, relative)
     return os.path.join(relative)
 
-def draw_button( text, x, y ):
-    font = pygame.font.SysFont(None, 40)
-    rect = pygame.Rect(x, y ,200 ,50)
-    pygame.draw.rect(screen, (200, 200, 210), rect)
-    label = font.render(text, True, (0, 0, 0))
-    screen.blit(label, (x + 10, y + 10))
-    return rect
-def load_records():
-    if os.path.exists('records.txt'):
-        with open('records.txt', "r", encoding="utf-8" ) as f:
-            lines = [line.strip().split(',') for line in f]
-            return [(name, int(score)) for name , score in lines]
-    return []
-def save_records(name, score):
-    records = load_records()
-    records.append((name, score))
-    records.sort(key= lambda x:x[1], reverse= True)
-    records = records[:5]
-    with open('records.txt', "w", encoding="utf-8" ) as f:
-        for name, score in records:
-            f.write(f"{name},{score}\n")
-            
-pygame.init()
-WIDTH, HEIGHT = 1200, 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Flappy birds")
-clock = pygame.time.Clock()
-start_time = pygame.time.get_ticks()
-
-bird_images = [pygame.image.load(resource_path('Bird4.png')).convert_alpha(),
-               pygame.image.load(resource_path('Bird5.png')).convert_alpha(),
-               pygame.image.load(resource_path('Bird8.png')).convert_alpha()]
-
-
-pipe_image = pygame.image.load(resource_path('pipe_ts.png')).convert_alpha()
-pipe_width = pipe_image.get_width()
-pipe_height = pipe_image.get_height()
-
-bird_index = 0
-bird_speed = 0
-gravity = 0.3
-bird_x = 50
-bird_y = HEIGHT // 2
-game_active = True
-score = 0
-
-big_font = pygame.font.SysFont(None, 72)
-score_font = pygame.font.SysFont(None, 36)
-score_text = None
-
-game_state = 'menu'
-username = ""
-input_active = False
-
-button_width = 200
-button_height = 50
-button_x = WIDTH // 2 - button_width // 2
-button_y = 215
-
-pipes = []
-pipe_gap = 125
-pipe_speed = 10
-pipe_frequency = 1000
-SPAWNPIPE = pygame.USEREVENT
-pygame.time.set_timer(SPAWNPIPE, pipe_frequency)
-
-font = pygame.font.SysFont(None,72)
-text = font.render("Game over", True, (255, 0, 0))
-
-
-while True:
-    clock.tick(60)
-    screen.fill((135, 205, 250))
-    
-
-    if game_state == 'menu':
-        title = big_font.render('Flappy bird', True,  (0, 0, 0))
-        screen.blit(title, (WIDTH // 2 - title.get_width()// 2, 100))
-        start_button = draw_button('Start game', button_x, button_y)
-        levels_button = draw_button('Levels', button_x, button_y + 15 + button_height)
-        records_button = draw_button('Records', button_x, button_y + 30  + button_height * 2 )
-    
-    elif game_state == 'records':
-        title = big_font.render("Top scores",True, (0, 0, 0))
-        screen.blit(title, (WIDTH // 2 - title.get_width()// 2, 100))
-        records = load_records()
-        for i, (name, rec_score) in enumerate(records):
-            rec_text = score_font.render(f"{i + 1}. {name} - {rec_score}", True ,(0, 0, 0))
-            screen.blit(rec_text, (WIDTH // 2 - rec_text.get_width()// 2, 200 + i * 40))
-        back_button = draw_button("Back", button_x, HEIGHT - 100)
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            pygame.quit()
-            sys.exit()
-        elif game_state == 'play':
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
-                    bird_speed = -6
-            if event.type == SPAWNPIPE:
-                pipe_y = random.randint(100, HEIGHT - 100 - pipe_gap)
-                pipes.append({"x": WIDTH, "y": pipe_y, "passed":False})
-        elif game_state == 'menu':
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                pos = pygame.mouse.get_pos()
-
-                if start_button.collidepoint(pos):
-                    bird_y = HEIGHT // 2
-                    bird_speed = 0
-                    pipes.clear()
-                    score = 0
-                    game_active = True
-                    game_state = 'play'
-                elif levels_button.collidepoint(pos):
-                    pass
-                elif records_button.collidepoint(pos):
-                    game_state = 'records'
+
+def open_bundle():
+    """assets.pak (asset_bundle.py), если он лежит рядом; иначе None — грузим PNG.
+
+    В PyInstaller-сборке PNG нет (Flappybird.spec кладёт только пакет),
+    поэтому там без пакета продолжать нельзя — понятная ошибка вместо
+    падения на первой же картинке.
+    """
+    path = resource_path('assets.pak')
+    try:
+        from asset_bundle import AssetBundle
+        return AssetBundle.open(path)
+    except (ImportError, OSError, ValueError) as exc:
+        if hasattr(sys, "_MEIPASS"):
+            raise RuntimeError(f"сборка повреждена: не читается {path} ({exc}); "
+                               f"пересоберите её после `python asset_bundle.py build`") from exc
+        return None
+
+
+def load_image(name, bundle=None):
+    if bundle is not None and name in bundle:
+        return bundle.image(name)
+    if hasattr(sys, "_MEIPASS"):
+        raise RuntimeError(f"в assets.pak нет {name}: пересоберите пакет (python asset_bundle.py build) и сборку")
+    return pygame.image.load(resource_path(name)).convert_alpha()
+
+
+async def main(max_frames=None, on_frame=None, frame_ms=None, config=None):
+    """Игровой цикл. max_frames/on_frame/frame_ms/config — для безоконного прогона (headless.py):
+    остановиться через max_frames кадров, вызывать on_frame(номер) в начале кадра,
+    считать каждый кадр длиной frame_ms вместо реального времени, играть с
+    параметрами config вместо FlappyConfig()."""
+    leaderboard = Leaderboard('records.txt')
+    # FLAPPY_SCORE_DB=scores.db — дополнительно хранить историю всех игр в SQLite
+    score_db = None
+    if os.environ.get("FLAPPY_SCORE_DB"):
+        from score_db import ScoreDB
+        score_db = ScoreDB(os.environ["FLAPPY_SCORE_DB"])
+    # FLAPPY_SCORE_SERVER=хост:порт — отправлять результаты на общий сервер (score_server.py)
+    score_client = None
+    if os.environ.get("FLAPPY_SCORE_SERVER"):
+        from score_client import ScoreClient
+        score_client = ScoreClient.from_address(os.environ["FLAPPY_SCORE_SERVER"])
+        score_client.start()
+    # FLAPPY_REPLAYS=папка — сохранять реплей каждой игры (seed + тики прыжков)
+    replay_dir = os.environ.get("FLAPPY_REPLAYS")
+    # FLAPPY_DAILY=1 — ежедневная трасса: у всех автоматов сегодня одни и те же трубы
+    daily = os.environ.get("FLAPPY_DAILY") == "1"
+    # FLAPPY_PLAYERS=2..8 — локальная игра на несколько птиц (party.py)
+    players = int(os.environ.get("FLAPPY_PLAYERS", 1))
+    party = None
+    # FLAPPY_ATTRACT=секунды — через столько секунд бездействия в меню играет автопилот (0 — никогда)
+    attract_ms = float(os.environ.get("FLAPPY_ATTRACT", 30)) * 1000
+    pilot = None
+    idle_ms = 0.0
+
+    pygame.init()
+    WIDTH, HEIGHT = 1200, 600
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Flappy birds")
+    clock = pygame.time.Clock()
+    # Частота отрисовки; симуляция всегда идёт тиками 1/60 с (см. sim.FlappyConfig.fps)
+    RENDER_FPS = int(os.environ.get("FLAPPY_FPS", 60))
+    # --dirty (или FLAPPY_DIRTY=1): перерисовывать только изменившиеся области
+    if "--dirty" in sys.argv or os.environ.get("FLAPPY_DIRTY") == "1":
+        renderer = DirtyRenderer(screen, (135, 205, 250))
+    else:
+        renderer = FullRenderer(screen, (135, 205, 250))
+    start_time = pygame.time.get_ticks()
+
+    # Картинки и симуляция создаются после первого кадра меню: в браузере
+    # они скачиваются отдельно (assets.fetch), меню им не нужно
+    bird_images = pipe_image = sim = None
+    pipe_height = 0
+    assets_task = None
+    start_requested = False
+
+    config = config or FlappyConfig()
+    flap = False
+    SIM_DT = 1000 / config.fps
+    accumulator = 0.0
+
+    big_font = pygame.font.SysFont(None, 72)
+    score_font = pygame.font.SysFont(None, 36)
+
+    game_state = 'menu'
+    username = ""
+    input_active = False
+
+    button_width = 200
+    button_height = 50
+    button_x = WIDTH // 2 - button_width // 2
+    button_y = 215
+
+    pipe_gap = config.pipe_gap
+
+    font = pygame.font.SysFont(None,72)
+    button_font = pygame.font.SysFont(None, 40)
+
+    # Виджеты создаются один раз; текст рендерится заново только при изменении
+    menu_title = Label(big_font, 'Flappy bird', (0, 0, 0), (0, 100), center_x=WIDTH // 2)
+    start_button = Button(button_font, 'Start game', pygame.Rect(button_x, button_y, button_width, button_height))
+    levels_button = Button(button_font, 'Levels', pygame.Rect(button_x, button_y + 15 + button_height, button_width, button_height))
+    records_button = Button(button_font, 'Records', pygame.Rect(button_x, button_y + 30 + button_height * 2, button_width, button_height))
+    records_title = Label(big_font, "Top scores", (0, 0, 0), (0, 100), center_x=WIDTH // 2)
+    records_list = ScoreList(score_font, (0, 0, 0), WIDTH // 2, 200)
+    back_button = Button(button_font, "Back", pygame.Rect(button_x, HEIGHT - 100, button_width, button_height))
+    score_label = CounterLabel(GlyphAtlas(score_font, (0, 0, 0)), "Score:", (10, 10))
+    over_label = Label(big_font, "Game Over", (255, 0, 0), (0, HEIGHT // 2 - 50), center_x=WIDTH // 2)
+    info_label = Label(font, "Press Enter to go to menu", (0, 0, 0), (0, HEIGHT // 2 + 10), center_x=WIDTH // 2)
+    demo_label = Label(button_font, "Demo - press any key", (0, 0, 0), (0, HEIGHT - 60), center_x=WIDTH // 2)
+
+    transforms = default_cache()
+    # F4 (или FLAPPY_TRACE=кадры) — записать трассу кадров для Perfetto (trace_capture.py)
+    tracer = default_tracer()
+    tracer.configure_from_env("FLAPPY")
+
+    @traced("draw_sim")
+    def draw_sim(alpha):
+        flipped_pipe = transforms.flip(pipe_image, False, True)
+        with tracer.span("pipes"):
+            for pipe_x, pipe_y, _ in sim.iter_pipes(alpha):
+                renderer.blit(pipe_image, (pipe_x, pipe_y + pipe_gap))
+                renderer.blit(flipped_pipe,(pipe_x , pipe_y - pipe_height), key="flipped_pipe")
+        renderer.blit(bird_images[int(sim.bird_index)], (sim.config.bird_x, sim.bird_y_at(alpha)))
+        score_label.value = sim.score
+        score_label.draw(renderer)
+
+
+    stats = FrameStats(RENDER_FPS)
+    # F3 (или FLAPPY_PROFILER=1) — оверлей со временем фаз кадра
+    profiler = PhaseProfiler(enabled=os.environ.get("FLAPPY_PROFILER") == "1", budget_ms=1000 / RENDER_FPS)
+    frame = 0
+    running = True
+    while running and (max_frames is None or frame < max_frames):
+        profiler.begin_frame()
+        tracer.frame()
+        elapsed = clock.tick(RENDER_FPS) if frame_ms is None else frame_ms
+        profiler.mark("tick")
+        stats.begin_frame()
+        if on_frame is not None:
+            on_frame(frame)
+        frame += 1
+        # Не больше 250 мс за кадр, чтобы после зависания не догонять бесконечно
+        accumulator += min(elapsed, 250)
+        renderer.begin()
+
+
+        if game_state == 'menu':
+            menu_title.draw(renderer)
+            start_button.draw(renderer)
+            levels_button.draw(renderer)
+            records_button.draw(renderer)
+
         elif game_state == 'records':
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                pos = pygame.mouse.get_pos()
-                if back_button.collidepoint(pos):
+            records_title.draw(renderer)
+            records_list.set_records(leaderboard.top(5))
+            records_list.draw(renderer)
+            back_button.draw(renderer)
+        profiler.mark("draw")
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif profiler.handle_event(event) or tracer.handle_event(event):
+                pass
+            elif game_state == 'play':
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_SPACE:
+                        flap = True
+            elif game_state == 'party':
+                party.handle_event(event)
+            elif game_state == 'attract':
+                if event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN):
+                    idle_ms = 0.0
                     game_state = 'menu'
+            elif game_state == 'menu':
+                if event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION):
+                    idle_ms = 0.0
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    if start_button.handle_event(event):
+                        start_requested = True
+                    elif levels_button.handle_event(event):
+                        pass
+                    elif records_button.handle_event(event):
+                        game_state = 'records'
+            elif game_state == 'records':
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    if back_button.handle_event(event):
+                        game_state = 'menu'
+            elif game_state == "Game_over":
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_RETURN:
+                        game_state = "menu"
+        profiler.mark("events")
+
+        if assets_task is None:
+            assets_task = asyncio.create_task(assets.fetch())
+        elif sim is None and assets_task.done():
+            assets_task.result()
+            # В сборке картинки уже раскодированы в assets.pak, иначе — PNG
+            bundle = open_bundle()
+            bird_images = [load_image('Bird4.png', bundle),
+                           load_image('Bird5.png', bundle),
+                           load_image('Bird8.png', bundle)]
+            pipe_image = load_image('pipe_ts.png', bundle)
+            pipe_height = pipe_image.get_height()
+            sim = FlappySim(config, masks=CollisionMasks(bird_images, pipe_image))
+            if players > 1:
+                from party import PartyMode
+                party = PartyMode(players, bird_images, pipe_image, score_font, config, sim.masks)
+        # Start до окончания загрузки откладывается до её конца
+        if start_requested and sim is not None:
+            start_requested = False
+            accumulator = 0.0
+            # SPACE, нажатый на кадре гибели, не должен прыгнуть в новой игре
+            flap = False
+            seed = daily_seed() if daily else random.getrandbits(32)
+            if party is not None:
+                party.reset(seed)
+                game_state = 'party'
+            else:
+                sim.reset(seed)
+                recorder = ReplayRecorder(sim)
+                game_state = 'play'
+        # Демо-режим: автопилот (autopilot.py) играет сам, пока в меню никого нет
+        if game_state == 'menu':
+            idle_ms += elapsed
+            if 0 < attract_ms <= idle_ms and sim is not None:
+                if pilot is None:
+                    try:
+                        from autopilot import Autopilot
+                        pilot = Autopilot.load(resource_path('autopilot.bin'), config)
+                    except (OSError, ValueError) as e:
+                        print("Демо-режим выключен:", e)
+                        attract_ms = 0
+                if pilot is not None:
+                    sim.reset(random.getrandbits(32))
+                    accumulator = 0.0
+                    flap = False
+                    game_state = 'attract'
+
+        if game_state == 'play':
+            score = sim.score
+            with tracer.span("update"):
+                while accumulator >= SIM_DT and sim.alive:
+                    sim.step(flap)
+                    recorder.after_step(flap)
+                    flap = False
+                    accumulator -= SIM_DT
+            profiler.mark("update")
+            alpha = accumulator / SIM_DT if sim.alive else 1.0
+            if sim.score != score:
+                print("Очки:", sim.score)
+            draw_sim(alpha)
+
+            if not sim.alive:
+                leaderboard.submit("player", sim.score)
+                if score_db is not None:
+                    score_db.add("player", sim.score, seed=sim.seed, duration=sim.tick, pipes=sim.score)
+                if score_client is not None:
+                    score_client.submit("player", sim.score, seed=sim.seed, duration=sim.tick)
+                if replay_dir:
+                    os.makedirs(replay_dir, exist_ok=True)
+                    save_replay(os.path.join(replay_dir, f"{int(time.time())}-{sim.seed}.flr"), recorder.replay)
+                game_state = "Game_over"
+        elif game_state == 'party':
+            accumulator = party.update(accumulator)
+            profiler.mark("update")
+            party.draw(renderer, accumulator / SIM_DT)
+            if party.over:
+                for name, score in party.results():
+                    leaderboard.submit(name, score)
+                    if score_db is not None:
+                        score_db.add(name, score, seed=party.sim.seed, duration=party.sim.tick, pipes=score)
+                    if score_client is not None:
+                        score_client.submit(name, score, seed=party.sim.seed, duration=party.sim.tick)
+                game_state = "Game_over"
+        elif game_state == 'attract':
+            with tracer.span("update"):
+                while accumulator >= SIM_DT:
+                    # Разбился — сразу новая трасса, демо не кончается
+                    if not sim.step(pilot.decide(sim)):
+                        sim.reset(random.getrandbits(32))
+                        flap = False
+                    accumulator -= SIM_DT
+            profiler.mark("update")
+            draw_sim(accumulator / SIM_DT)
+            demo_label.draw(renderer)
         elif game_state == "Game_over":
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RETURN:
-                    game_state = "menu"
-
-    
-
-    
-    if game_state == 'play':
-        bird_speed += gravity
-        bird_y += bird_speed
-        bird_index += 0.4
-        if bird_index >= len(bird_images):
-            bird_index = 0
-        current_bird = bird_images[int(bird_index)]
-        if bird_y > HEIGHT :
-            game_active = False
-        bird_rect = pygame.Rect(bird_x, bird_y, current_bird.get_width(),current_bird.get_height())
-        for pipe in pipes:
-            pipe["x"] -= pipe_speed
-        pipes = [pipe for pipe in pipes if pipe["x"] + pipe_width > 0] 
-        for pipe in pipes:
-            screen.blit(pipe_image, (pipe["x"], pipe["y"] + pipe_gap))
-            flipped_pipe = pygame.transform.flip(pipe_image, False, True)
-            screen.blit(flipped_pipe,(pipe["x"] , pipe["y"] - pipe_height))
-            top_pipe_rect = pygame.Rect(pipe["x"] , pipe["y"] - pipe_height, pipe_width - 5, pipe_height - 5)
-            bottom_pipe_rect = pygame.Rect(pipe["x"] , pipe["y"] + pipe_gap, pipe_width - 5, pipe_height - 5)
-            if bird_rect.colliderect(top_pipe_rect) or bird_rect.colliderect(bottom_pipe_rect):
-                game_active = False
-            if pipe['x'] + pipe_width < bird_x and not pipe['passed']:
-                score += 1
-                pipe['passed'] = True
-                print("Очки:", score)
-        screen.blit(current_bird, (bird_x, bird_y))
-        score_text = score_font.render(f"Score:{score}", True, (0, 0, 0))
-        screen.blit(score_text, (10,10))
-        
-        if not game_active:
-            save_records("player",score)
-            game_state = "Game_over"
-    elif game_state == "Game_over":
-        over_text = big_font.render("Game Over", True, (255, 0, 0))
-        info_text = font.render("Press Enter to go to menu", True, (0, 0, 0))
-        screen.blit(over_text, (WIDTH // 2 - over_text.get_width() // 2, HEIGHT // 2 - 50))
-        screen.blit(info_text, (WIDTH // 2 - info_text.get_width() // 2, HEIGHT // 2 + 10))
-        #screen.blit(text, (WIDTH//2 - text.get_width()//2, HEIGHT//2 - text.get_height()//2)) 
-  
-      
-    pygame.display.flip()
-    
\ No newline at end of file
+            over_label.draw(renderer)
+            info_label.draw(renderer)
+
+
+        profiler.draw(renderer)
+        profiler.mark("draw")
+        with tracer.span("display.flip"):
+            renderer.present()
+        profiler.mark("flip")
+        stats.end_frame()
+        # Отдаём управление циклу событий (в браузере — обязательно каждый кадр)
+        await asyncio.sleep(0)
+
+    tracer.stop()
+    leaderboard.close()
+    if score_db is not None:
+        score_db.close()
+    if score_client is not None:
+        await score_client.close()
+    if os.environ.get("FLAPPY_FRAME_STATS"):
+        stats.save(os.environ["FLAPPY_FRAME_STATS"])
+    print(stats.format())
+    # Статистика кэшей — только при включённом профилировщике (FLAPPY_PROFILER=1)
+    if os.environ.get("FLAPPY_PROFILER") == "1":
+        print(transforms.stats())
+        print(default_text_cache().stats())
+    pygame.quit()
+    return stats
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
+    sys.exit()
@@ -0,0 +1,125 @@
+"""Локальная игра на несколько птиц (2–8 игроков за одной клавиатурой).
+
+Все птицы летят сквозь один поток труб с общим seed. Физика, столкновения
+и очки считаются одним проходом batch_sim.BatchSim: трубы перебираются
+один раз за тик, и только те, что рядом с bird_x, а все птицы проверяются
+по ним векторно. Каждый игрок прыгает своей клавишей, птицы различаются
+цветом.
+
+    FLAPPY_PLAYERS=4 python main.py
+"""
+
+from __future__ import annotations
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pygame
+
+from batch_sim import BatchSim
+from sim import FlappyConfig
+from transform_cache import default_cache
+from text_cache import GlyphAtlas
+from trace_capture import default_tracer, traced
+from ui import CounterLabel
+
+MAX_PLAYERS = 8
+# Клавиши разнесены по клавиатуре, чтобы игроки не мешали друг другу
+PLAYER_KEYS = (
+    pygame.K_SPACE, pygame.K_UP, pygame.K_q, pygame.K_p,
+    pygame.K_z, pygame.K_m, pygame.K_g, pygame.K_KP0,
+)
+PLAYER_COLORS = (
+    (255, 255, 255), (255, 120, 120), (120, 200, 255), (140, 255, 140),
+    (255, 220, 90), (220, 140, 255), (255, 170, 60), (150, 150, 150),
+)
+
+
+def tint(surface: pygame.Surface, color: Tuple[int, int, int]) -> pygame.Surface:
+    """Копия картинки, умноженная на цвет (прозрачность сохраняется)."""
+    tinted = surface.copy()
+    tinted.fill(color + (255,), special_flags=pygame.BLEND_RGBA_MULT)
+    return tinted
+
+
+class PartyMode:
+    """Состояние мультиплеера: BatchSim, ввод игроков и отрисовка."""
+
+    def __init__(
+        self,
+        players: int,
+        bird_images: Sequence[pygame.Surface],
+        pipe_image: pygame.Surface,
+        font: pygame.font.Font,
+        config: Optional[FlappyConfig] = None,
+        masks=None,
+    ) -> None:
+        if not 2 <= players <= MAX_PLAYERS:
+            raise ValueError(f"игроков должно быть от 2 до {MAX_PLAYERS}: {players}")
+        self.players = players
+        self.sim = BatchSim(players, config, masks=masks)
+        self.keys = {key: i for i, key in enumerate(PLAYER_KEYS[:players])}
+        self.names = [f"P{i + 1}" for i in range(players)]
+        # Кадры анимации для каждого игрока; первый — без подкраски
+        self.birds = [
+            [tint(img, PLAYER_COLORS[i]) if i else img for img in bird_images]
+            for i in range(players)
+        ]
+        self.pipe_image = pipe_image
+        self.flipped_pipe = default_cache().flip(pipe_image, False, True)
+        self.labels = [
+            CounterLabel(GlyphAtlas(font, tuple(c // 2 for c in PLAYER_COLORS[i])), f"{name}: ", (10, 10 + 30 * i))
+            for i, name in enumerate(self.names)
+        ]
+        self.flaps = np.zeros(players, dtype=bool)
+        self.dt = 1000 / self.sim.config.fps
+        self.reset()
+
+    def reset(self, seed: Optional[int] = None) -> None:
+        self.sim.reset(seed)
+        self.flaps[:] = False
+        self.prev_bird_y = self.sim.bird_y.copy()
+        self.prev_scroll = self.sim.scroll
+
+    @property
+    def over(self) -> bool:
+        return not self.sim.alive.any()
+
+    def handle_event(self, event: pygame.event.Event) -> None:
+        if event.type == pygame.KEYDOWN and event.key in self.keys:
+            self.flaps[self.keys[event.key]] = True
+
+    @traced("PartyMode.update")
+    def update(self, accumulator: float) -> float:
+        """Прогнать накопившиеся тики; возвращает остаток времени, мс."""
+        sim = self.sim
+        while accumulator >= self.dt and sim.alive.any():
+            self.prev_bird_y[:] = sim.bird_y
+            self.prev_scroll = sim.scroll
+            sim.step(self.flaps)
+            self.flaps[:] = False
+            accumulator -= self.dt
+        return accumulator
+
+    @traced("PartyMode.draw")
+    def draw(self, renderer, alpha: float) -> None:
+        sim = self.sim
+        cfg = sim.config
+        if self.over:
+            alpha = 1.0
+        scroll = self.prev_scroll + (sim.scroll - self.prev_scroll) * alpha
+        with default_tracer().span("pipes"):
+            for pipe_x, pipe_y, _ in sim.pipes.items(scroll):
+                renderer.blit(self.pipe_image, (pipe_x, pipe_y + cfg.pipe_gap))
+                renderer.blit(self.flipped_pipe, (pipe_x, pipe_y - sim.pipe_height))
+        frame = int(sim.bird_index)
+        bird_y = self.prev_bird_y + (sim.bird_y - self.prev_bird_y) * alpha
+        for i in np.flatnonzero(sim.alive):
+            renderer.blit(self.birds[i][frame], (cfg.bird_x, bird_y[i]))
+        for label, score in zip(self.labels, sim.score):
+            label.value = score
+            label.draw(renderer)
+
+    def results(self) -> List[Tuple[str, int]]:
+        """(имя, очки) каждого игрока — для таблицы рекордов."""
+        return [(name, int(score)) for name, score in zip(self.names, self.sim.score)]
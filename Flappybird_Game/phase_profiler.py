@@ -0,0 +1,187 @@
+"""Оверлей с временем фаз кадра: события, обновление, отрисовка, flip, tick.
+
+Игровой цикл отмечает границы фаз вызовом mark(фаза): время с прошлой
+отметки (perf_counter_ns) прибавляется к этой фазе текущего кадра. Одна
+фаза может встречаться в кадре несколько раз (например, меню рисуется до
+обработки событий) — куски складываются. begin_frame() закрывает прошлый
+кадр и начинает новый.
+
+Пока оверлей скрыт, begin_frame()/mark() сразу возвращаются — ни часов,
+ни записи. После включения (F3 или переменная окружения) копится окно
+последних window кадров: среднее и p99 по каждой фазе и график времени
+кадра (столбик на кадр, по цветам фаз, линия — бюджет 1/60 с). Панель
+перестраивается раз в refresh кадров, чтобы сам оверлей почти не стоил.
+
+    profiler = PhaseProfiler(enabled=os.environ.get("FLAPPY_PROFILER") == "1")
+    while running:
+        profiler.begin_frame()
+        clock.tick(60); profiler.mark("tick")
+        ...events...;  profiler.mark("events")
+        ...update...;  profiler.mark("update")
+        ...draw...;    profiler.draw(screen); profiler.mark("draw")
+        flip();        profiler.mark("flip")
+"""
+
+from __future__ import annotations
+
+import time
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pygame
+
+from text_cache import GlyphAtlas
+
+PHASES: Tuple[str, ...] = ("events", "update", "draw", "flip", "tick")
+COLORS: Dict[str, Tuple[int, int, int]] = {
+    "events": (90, 160, 240),
+    "update": (240, 170, 60),
+    "draw": (90, 210, 120),
+    "flip": (210, 90, 200),
+    "tick": (120, 120, 130),
+}
+TOGGLE_KEY = pygame.K_F3
+
+
+class PhaseProfiler:
+    """Кольцевые буферы времени фаз (нс) за последние window кадров."""
+
+    def __init__(
+        self,
+        phases: Sequence[str] = PHASES,
+        window: int = 240,
+        enabled: bool = False,
+        refresh: int = 10,
+        budget_ms: float = 1000 / 60,
+    ) -> None:
+        self.phases = tuple(phases)
+        self.window = window
+        self.refresh = refresh
+        self.budget_ms = budget_ms
+        self.enabled = False
+        self._panel: Optional[pygame.Surface] = None
+        self._atlas: Optional[GlyphAtlas] = None
+        self._font: Optional[pygame.font.Font] = None
+        if enabled:
+            self.toggle()
+
+    def toggle(self) -> None:
+        """Показать/скрыть оверлей; при показе история начинается заново."""
+        self.enabled = not self.enabled
+        if self.enabled:
+            self.samples: Dict[str, array] = {p: array("q", bytes(8 * self.window)) for p in self.phases}
+            self.frames = 0  # сколько кадров записано всего
+            self._current: Dict[str, int] = dict.fromkeys(self.phases, 0)
+            self._last = 0
+            self._version = 0
+
+    def begin_frame(self) -> None:
+        if not self.enabled:
+            return
+        if self._last:
+            slot = self.frames % self.window
+            for phase, ns in self._current.items():
+                self.samples[phase][slot] = ns
+                self._current[phase] = 0
+            self.frames += 1
+        self._last = time.perf_counter_ns()
+
+    def mark(self, phase: str) -> None:
+        """Отнести время с прошлой отметки к phase."""
+        if not self.enabled or not self._last:
+            return
+        now = time.perf_counter_ns()
+        self._current[phase] += now - self._last
+        self._last = now
+
+    def handle_event(self, event: pygame.event.Event) -> bool:
+        """True, если событие — клавиша переключения оверлея."""
+        if event.type == pygame.KEYDOWN and event.key == TOGGLE_KEY:
+            self.toggle()
+            return True
+        return False
+
+    def _recent(self, phase: str) -> List[int]:
+        n = min(self.frames, self.window)
+        return list(self.samples[phase][:n])
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """{фаза: {"mean": мс, "p99": мс}} по окну, плюс "frame" — кадр целиком."""
+        n = min(self.frames, self.window)
+        out: Dict[str, Dict[str, float]] = {}
+        if not n:
+            return out
+        totals = [0] * n
+        for phase in self.phases:
+            values = self._recent(phase)
+            for i, v in enumerate(values):
+                totals[i] += v
+            out[phase] = _stats(values)
+        out["frame"] = _stats(totals)
+        return out
+
+    def _build_panel(self, font: pygame.font.Font) -> pygame.Surface:
+        if self._atlas is None or self._atlas.font is not font:
+            self._atlas = GlyphAtlas(font, (240, 240, 240), "0123456789.")
+        atlas = self._atlas
+        line_h = font.get_linesize()
+        graph_h = 60
+        stats = self.summary()
+        rows = [p for p in (*self.phases, "frame") if p in stats]
+        gap = atlas.size("  ")[0]
+        col_mean = 22 + max(atlas.size(p)[0] for p in (*rows, "фаза")) + gap
+        col_p99 = col_mean + max(atlas.size("000.00")[0], atlas.size("ср, мс")[0]) + gap
+        width = max(self.window + 16, col_p99 + atlas.size("p99, мс")[0] + 8)
+        panel = pygame.Surface((width, 8 + line_h * (len(rows) + 1) + graph_h + 8), pygame.SRCALPHA)
+        panel.fill((10, 10, 14, 190))
+        for text, x in (("фаза", 22), ("ср, мс", col_mean), ("p99, мс", col_p99)):
+            atlas.draw(panel, text, (x, 4))
+        for i, phase in enumerate(rows):
+            y = 4 + line_h * (i + 1)
+            pygame.draw.rect(panel, COLORS.get(phase, (240, 240, 240)), (8, y + line_h // 4, 8, line_h // 2))
+            atlas.draw(panel, phase, (22, y))
+            atlas.draw(panel, f"{stats[phase]['mean']:.2f}", (col_mean, y))
+            atlas.draw(panel, f"{stats[phase]['p99']:.2f}", (col_p99, y))
+
+        # График: столбик на кадр, сегменты по фазам; полная высота — два бюджета
+        top = 8 + line_h * (len(rows) + 1)
+        scale = graph_h / (2 * self.budget_ms * 1e6)
+        n = min(self.frames, self.window)
+        start = self.frames - n
+        for i in range(n):
+            slot = (start + i) % self.window
+            y = top + graph_h
+            for phase in self.phases:
+                h = self.samples[phase][slot] * scale
+                if h >= 0.5:
+                    y1 = max(top, y - h)
+                    pygame.draw.line(panel, COLORS.get(phase, (200, 200, 200)), (8 + i, y), (8 + i, y1))
+                    y = y1
+        budget_y = top + graph_h - int(self.budget_ms * 1e6 * scale)
+        pygame.draw.line(panel, (240, 80, 80), (8, budget_y), (8 + self.window, budget_y))
+        return panel
+
+    def draw(self, target, font: Optional[pygame.font.Font] = None, pos: Tuple[int, int] = (10, 50)) -> None:
+        """Нарисовать панель; target — Surface или рендерер из dirty_render."""
+        if not self.enabled:
+            return
+        if self._panel is None or self.frames % self.refresh == 0:
+            if font is None:
+                if self._font is None:
+                    self._font = pygame.font.SysFont(None, 22)
+                font = self._font
+            self._panel = self._build_panel(font)
+            self._version += 1
+        if isinstance(target, pygame.Surface):
+            target.blit(self._panel, pos)
+        else:
+            target.blit(self._panel, pos, key=("phase_profiler", self._version))
+
+
+def _stats(values_ns: List[int]) -> Dict[str, float]:
+    ordered = sorted(values_ns)
+    n = len(ordered)
+    return {
+        "mean": sum(ordered) / n / 1e6,
+        "p99": ordered[min(n - 1, int(n * 0.99))] / 1e6,
+    }
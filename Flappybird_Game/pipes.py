@@ -0,0 +1,64 @@
+"""Хранилище труб: кольцевой буфер фиксированной ёмкости (структура массивов).
+
+Координата x хранится в «мировых» пикселях — пройденное расстояние на
+момент появления плюс ширина экрана. Экранная x = мировая x - scroll, так
+что сдвиг всех труб за кадр — одно сложение, а не цикл по трубам. Трубы
+в буфере всегда упорядочены по x, поэтому столкновения и очки проверяются
+только у труб рядом с птицей.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Iterator, Tuple
+
+
+class PipeRing:
+    """Кольцевой буфер труб: мировые x, y зазора и битовая маска «пройдена»."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.world_x = array("d", bytes(8 * capacity))
+        self.gap_y = array("i", bytes(4 * capacity))
+        self.passed = 0  # бит slot = 1 — трубу уже засчитали
+        self.head = 0    # абсолютный номер самой старой трубы
+        self.tail = 0    # абсолютный номер следующей трубы
+
+    def __len__(self) -> int:
+        return self.tail - self.head
+
+    def clear(self) -> None:
+        self.head = self.tail = 0
+        self.passed = 0
+
+    def push(self, world_x: float, gap_y: int) -> None:
+        """Добавить трубу в хвост (x должен быть не меньше, чем у предыдущих)."""
+        if self.tail - self.head >= self.capacity:
+            raise OverflowError("PipeRing переполнен: увеличьте capacity")
+        slot = self.tail % self.capacity
+        self.world_x[slot] = world_x
+        self.gap_y[slot] = gap_y
+        self.passed &= ~(1 << slot)
+        self.tail += 1
+
+    def drop_before(self, world_x: float) -> None:
+        """Убрать из головы трубы, левый край которых не больше world_x."""
+        while self.head < self.tail and self.world_x[self.head % self.capacity] <= world_x:
+            self.head += 1
+
+    def slots(self) -> Iterator[int]:
+        """Номера ячеек живых труб, от самой левой к правой."""
+        cap = self.capacity
+        for i in range(self.head, self.tail):
+            yield i % cap
+
+    def is_passed(self, slot: int) -> bool:
+        return bool(self.passed >> slot & 1)
+
+    def mark_passed(self, slot: int) -> None:
+        self.passed |= 1 << slot
+
+    def items(self, scroll: float) -> Iterator[Tuple[float, int, bool]]:
+        """(экранная x, y зазора, пройдена) для всех живых труб."""
+        for slot in self.slots():
+            yield self.world_x[slot] - scroll, self.gap_y[slot], self.is_passed(slot)
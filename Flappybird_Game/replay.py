@@ -0,0 +1,279 @@
+"""Запись и воспроизведение игр Flappy bird.
+
+Игра полностью определяется seed'ом труб и номерами тиков, на которых
+был нажат SPACE, поэтому реплей — это только они (плюс параметры, если
+они не по умолчанию) в маленьком двоичном формате:
+
+    заголовок  "<4sBBQII": b"FLPR", версия, флаги, seed, тиков, заявленный счёт
+    [флаг 1]   параметры FlappyConfig (CONFIG_FORMAT; в версии 1 — без pixel_collision)
+    varint     число нажатий, затем разности номеров тиков (LEB128)
+    "<I"       crc32 всего предыдущего
+
+Поток реплеев (например, за день с нескольких автоматов) — это просто
+записи подряд, каждая с префиксом длины "<I" (см. write_stream/iter_stream).
+
+    python replay.py check run.flr        # пересчитать без отрисовки
+    python replay.py play run.flr --speed 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import struct
+import sys
+import time
+import zlib
+from dataclasses import astuple, dataclass, field, replace
+from typing import BinaryIO, Iterator, List, Optional
+
+from sim import FlappyConfig, FlappySim
+
+MAGIC = b"FLPR"
+VERSION = 2
+HEADER = struct.Struct("<4sBBQII")
+CONFIG_FORMAT = struct.Struct("<HHHddHHdIHd?")  # поля FlappyConfig по порядку
+CONFIG_FORMAT_V1 = struct.Struct("<HHHddHHdIHd")  # до столкновений по маскам
+CRC = struct.Struct("<I")
+STREAM_PREFIX = struct.Struct("<I")
+FLAG_CONFIG = 1
+# Четыре часа игры: дальше реплей считается испорченным, а не рекордом
+MAX_TICKS = 4 * 60 * 60 * 60
+
+
+class ReplayError(ValueError):
+    """Повреждённый или несовместимый файл реплея."""
+
+
+@dataclass
+class Replay:
+    seed: int
+    flaps: List[int] = field(default_factory=list)  # тики (sim.tick), на которых был прыжок
+    ticks: int = 0
+    score: int = 0
+    config: FlappyConfig = field(default_factory=FlappyConfig)
+    version: int = VERSION  # версия формата, из которой прочитан реплей
+
+
+class ReplayRecorder:
+    """Собирает реплей по ходу игры: вызывать after_step() после каждого sim.step()."""
+
+    def __init__(self, sim: FlappySim) -> None:
+        self.sim = sim
+        self.replay = Replay(sim.seed or 0, config=sim.config)
+
+    def after_step(self, flap: bool) -> None:
+        if flap:
+            self.replay.flaps.append(self.sim.tick)
+        self.replay.ticks = self.sim.tick
+        self.replay.score = self.sim.score
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int):
+    value = shift = 0
+    while True:
+        if pos >= len(data):
+            raise ReplayError("обрезанный реплей")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def check_config(config: FlappyConfig) -> None:
+    """ReplayError, если с такими параметрами симуляция не запустится или не кончится."""
+    numbers = astuple(config)
+    if not all(math.isfinite(v) for v in numbers):
+        raise ReplayError("нечисловые параметры")
+    checks = (
+        (100 <= config.width <= 4000, "width"),
+        (100 <= config.height <= 4000, "height"),
+        (1 <= config.fps <= 1000, "fps"),
+        (0 <= config.gravity <= 10, "gravity"),
+        (-100 <= config.flap_speed <= 0, "flap_speed"),
+        (0 <= config.bird_x < config.width, "bird_x"),
+        (1 <= config.pipe_speed <= 100, "pipe_speed"),
+        (1 <= config.pipe_frequency <= 60000, "pipe_frequency"),
+        (0 <= config.anim_step <= 10, "anim_step"),
+        # Course.gap: randint(gap_margin, height - gap_margin - pipe_gap)
+        (config.pipe_gap >= 1 and config.height - 2 * config.gap_margin - config.pipe_gap >= 0,
+         "pipe_gap/gap_margin"),
+    )
+    for ok, name in checks:
+        if not ok:
+            raise ReplayError(f"недопустимый параметр {name}")
+
+
+def encode(replay: Replay) -> bytes:
+    custom = replay.config != FlappyConfig()
+    out = bytearray(HEADER.pack(MAGIC, VERSION, FLAG_CONFIG if custom else 0,
+                                replay.seed, replay.ticks, replay.score))
+    if custom:
+        out += CONFIG_FORMAT.pack(*astuple(replay.config))
+    _write_varint(out, len(replay.flaps))
+    prev = 0
+    for tick in replay.flaps:
+        _write_varint(out, tick - prev)
+        prev = tick
+    out += CRC.pack(zlib.crc32(out))
+    return bytes(out)
+
+
+def decode(data: bytes) -> Replay:
+    if len(data) < HEADER.size + CRC.size:
+        raise ReplayError("слишком короткий файл")
+    body, (crc,) = data[: -CRC.size], CRC.unpack(data[-CRC.size:])
+    if zlib.crc32(body) != crc:
+        raise ReplayError("неверная контрольная сумма")
+    magic, version, flags, seed, ticks, score = HEADER.unpack_from(body)
+    if magic != MAGIC:
+        raise ReplayError("это не реплей Flappy bird")
+    if version not in (1, VERSION):
+        raise ReplayError(f"неподдерживаемая версия {version}")
+    if ticks > MAX_TICKS:
+        raise ReplayError(f"слишком длинный реплей: {ticks} тиков")
+    pos = HEADER.size
+    config = FlappyConfig()
+    if flags & FLAG_CONFIG:
+        fmt = CONFIG_FORMAT if version == VERSION else CONFIG_FORMAT_V1
+        if len(body) < pos + fmt.size:
+            raise ReplayError("обрезанный реплей")
+        config = FlappyConfig(*fmt.unpack_from(body, pos))
+        pos += fmt.size
+        check_config(config)
+    if version == 1:
+        # Версия 1 записывалась со старыми прямоугольными столкновениями
+        config = replace(config, pixel_collision=False)
+    count, pos = _read_varint(body, pos)
+    flaps = []
+    tick = 0
+    for _ in range(count):
+        delta, pos = _read_varint(body, pos)
+        tick += delta
+        flaps.append(tick)
+    return Replay(seed, flaps, ticks, score, config, version)
+
+
+def save(path: str, replay: Replay) -> None:
+    with open(path, "wb") as f:
+        f.write(encode(replay))
+
+
+def load(path: str) -> Replay:
+    with open(path, "rb") as f:
+        return decode(f.read())
+
+
+def write_stream(f: BinaryIO, replay: Replay) -> None:
+    """Дописать реплей в поток с префиксом длины."""
+    data = encode(replay)
+    f.write(STREAM_PREFIX.pack(len(data)))
+    f.write(data)
+
+
+def iter_stream(f: BinaryIO) -> Iterator[bytes]:
+    """Сырые записи реплеев из потока (декодирует вызывающий)."""
+    while True:
+        prefix = f.read(STREAM_PREFIX.size)
+        if not prefix:
+            return
+        if len(prefix) < STREAM_PREFIX.size:
+            raise ReplayError("обрезанный поток реплеев")
+        (size,) = STREAM_PREFIX.unpack(prefix)
+        data = f.read(size)
+        if len(data) < size:
+            raise ReplayError("обрезанный поток реплеев")
+        yield data
+
+
+def simulate(replay: Replay, sim: Optional[FlappySim] = None) -> FlappySim:
+    """Переиграть реплей без отрисовки; возвращает симуляцию в конечном состоянии."""
+    sim = sim or FlappySim(replay.config)
+    if sim.config != replay.config:
+        sim = FlappySim(replay.config, sim.bird_sizes, (sim.pipe_width, sim.pipe_height))
+    sim.reset(replay.seed)
+    flaps = set(replay.flaps)
+    step = sim.step
+    while sim.tick < replay.ticks and step(sim.tick + 1 in flaps):
+        pass
+    return sim
+
+
+def play(replay: Replay, speed: float = 1.0) -> FlappySim:
+    """Показать реплей в окне; speed — во сколько раз быстрее реального времени."""
+    import pygame
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    cfg = replay.config
+    pygame.init()
+    screen = pygame.display.set_mode((cfg.width, cfg.height))
+    pygame.display.set_caption("Flappy birds — replay")
+    bird_images = [pygame.image.load(os.path.join(here, name)).convert_alpha()
+                   for name in ("Bird4.png", "Bird5.png", "Bird8.png")]
+    pipe_image = pygame.image.load(os.path.join(here, "pipe_ts.png")).convert_alpha()
+    flipped_pipe = pygame.transform.flip(pipe_image, False, True)
+    score_font = pygame.font.SysFont(None, 36)
+    sim = FlappySim(cfg, tuple(image.get_size() for image in bird_images), pipe_image.get_size())
+    sim.reset(replay.seed)
+    flaps = set(replay.flaps)
+    clock = pygame.time.Clock()
+    sim_dt = 1000 / cfg.fps / speed
+    accumulator = 0.0
+    while sim.alive and sim.tick < replay.ticks:
+        accumulator += min(clock.tick(60), 250)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                return sim
+        while accumulator >= sim_dt and sim.alive and sim.tick < replay.ticks:
+            sim.step(sim.tick + 1 in flaps)
+            accumulator -= sim_dt
+        screen.fill((135, 205, 250))
+        for pipe_x, pipe_y, _ in sim.iter_pipes():
+            screen.blit(pipe_image, (pipe_x, pipe_y + cfg.pipe_gap))
+            screen.blit(flipped_pipe, (pipe_x, pipe_y - sim.pipe_height))
+        screen.blit(bird_images[int(sim.bird_index)], (cfg.bird_x, sim.bird_y))
+        screen.blit(score_font.render(f"Score:{sim.score}", True, (0, 0, 0)), (10, 10))
+        pygame.display.flip()
+    pygame.time.wait(1000)
+    pygame.quit()
+    return sim
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Реплеи Flappy bird")
+    sub = parser.add_subparsers(dest="command", required=True)
+    check = sub.add_parser("check", help="пересчитать реплеи без отрисовки")
+    check.add_argument("files", nargs="+")
+    show = sub.add_parser("play", help="показать реплей в окне")
+    show.add_argument("file")
+    show.add_argument("--speed", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    if args.command == "play":
+        sim = play(load(args.file), args.speed)
+        print(f"счёт: {sim.score}")
+        return 0
+    for path in args.files:
+        replay = load(path)
+        start = time.perf_counter()
+        sim = simulate(replay)
+        elapsed = time.perf_counter() - start
+        status = "ok" if sim.score == replay.score else "MISMATCH"
+        print(f"{path}: {status} score={sim.score} claimed={replay.score} "
+              f"ticks={sim.tick} ({sim.tick / max(elapsed, 1e-9):.0f} тиков/с)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""Отправка результатов на общий сервер рекордов (score_server.py).
+
+submit() только кладёт игру в очередь и сразу возвращается. Фоновая задача
+asyncio раз в interval секунд (или когда набралось max_batch игр)
+отправляет всё накопленное одним сообщением по единственному постоянному
+TCP-соединению. При ошибке соединение закрывается, пачка остаётся в
+очереди, повтор — с экспоненциальной задержкой. У каждой игры свой uid,
+так что сервер не сохранит её дважды, если ответ потерялся.
+
+Протокол — JSON по строке в обе стороны:
+    -> {"id": 1, "runs": [{"uid": ..., "player": ..., "score": ..., ...}]}
+    <- {"id": 1, "stored": 3}
+    <- {"id": 1, "stored": 2, "rejected": 1}   # битые игры сервер не примет никогда
+    <- {"id": 1, "error": ...}                 # пачка не разобрана — повторить
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import random
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+DEFAULT_PORT = 8765
+
+
+class ScoreClient:
+    """Очередь результатов с пакетной отправкой; все сетевые операции — в задаче asyncio."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        interval: float = 3.0,
+        max_batch: int = 500,
+        timeout: float = 5.0,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.interval = interval
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.client_id = os.urandom(6).hex()
+        self.sent = 0
+        self.failures = 0
+        self.rejected = 0  # игр, которые сервер отверг как битые (они не повторяются)
+        self._queue: Deque[Dict[str, object]] = deque()
+        self._seq = 0
+        self._msg_id = 0
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+    @classmethod
+    def from_address(cls, address: str, **kwargs) -> "ScoreClient":
+        """Из строки «хост:порт» (например, значения FLAPPY_SCORE_SERVER)."""
+        host, _, port = address.rpartition(":")
+        return cls(host or "127.0.0.1", int(port or DEFAULT_PORT), **kwargs)
+
+    def start(self) -> None:
+        """Запустить фоновую отправку (вызывать из работающего цикла asyncio)."""
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    def submit(self, player: str, score: int, seed: Optional[int] = None, duration: Optional[int] = None) -> None:
+        """Поставить игру в очередь; не ждёт сети."""
+        self._seq += 1
+        self._queue.append({
+            "uid": f"{self.client_id}-{self._seq}",
+            "player": player,
+            "score": int(score),
+            "played_at": time.time(),
+            "seed": seed,
+            "duration": duration,
+        })
+        if len(self._queue) >= self.max_batch and self._wake is not None:
+            self._wake.set()
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """Попытаться дослать очередь (не дольше timeout) и закрыть соединение."""
+        self._closing = True
+        if self._task is not None:
+            self._wake.set()
+            try:
+                await asyncio.wait_for(self._task, timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._task = None
+        await self._disconnect()
+
+    async def _run(self) -> None:
+        delay = self.backoff
+        # Первая отправка — в случайный момент интервала, чтобы автоматы,
+        # включённые одновременно, не слали пачки хором
+        wait = random.uniform(0, self.interval)
+        while True:
+            if not self._closing:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+            self._wake.clear()
+            wait = self.interval
+            while self._queue:
+                batch = [self._queue[i] for i in range(min(len(self._queue), self.max_batch))]
+                try:
+                    self.rejected += await self._send(batch)
+                except (OSError, asyncio.TimeoutError, ValueError):
+                    self.failures += 1
+                    await self._disconnect()
+                    # Задержка растёт вдвое, со случайным разбросом, чтобы
+                    # тысячи автоматов не переподключались одновременно
+                    await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+                    delay = min(delay * 2, self.max_backoff)
+                    continue
+                delay = self.backoff
+                for _ in batch:
+                    self._queue.popleft()
+                self.sent += len(batch)
+            if self._closing:
+                return
+
+    async def _send(self, batch: List[Dict[str, object]]) -> int:
+        """Отправить пачку и дождаться ответа; возвращает, сколько игр сервер отверг."""
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port), self.timeout
+            )
+        self._msg_id += 1
+        message = {"id": self._msg_id, "runs": batch}
+        self._writer.write(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+        await asyncio.wait_for(self._writer.drain(), self.timeout)
+        line = await asyncio.wait_for(self._reader.readline(), self.timeout)
+        if not line:
+            raise ConnectionResetError("сервер закрыл соединение")
+        reply = json.loads(line)
+        if reply.get("id") != self._msg_id or "error" in reply:
+            raise ValueError(f"неожиданный ответ сервера: {reply}")
+        return int(reply.get("rejected", 0))
+
+    async def _disconnect(self) -> None:
+        writer, self._writer, self._reader = self._writer, None, None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
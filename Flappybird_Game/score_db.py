@@ -0,0 +1,189 @@
+"""История всех игр в SQLite: топ-N, лучший результат игрока, перцентили.
+
+Каждая игра хранится целиком (время, seed, длительность, пройденные трубы).
+База работает в режиме WAL, вставки копятся и пишутся пачками в фоновом
+потоке, так что запись никогда не задерживает кадр.
+
+Перенос старого records.txt:
+
+    python score_db.py import records.txt scores.db   # повторный запуск ничего не добавит
+"""
+
+from __future__ import annotations
+
+import argparse
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from typing import List, NamedTuple, Optional, Tuple
+
+from leaderboard import read_records
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id          INTEGER PRIMARY KEY,
+    player      TEXT    NOT NULL,
+    score       INTEGER NOT NULL,
+    played_at   REAL    NOT NULL,
+    seed        INTEGER,
+    duration    INTEGER,
+    pipes       INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_score ON runs (score DESC);
+CREATE INDEX IF NOT EXISTS runs_player_score ON runs (player, score DESC);
+"""
+
+
+class Run(NamedTuple):
+    """Одна сыгранная игра."""
+
+    player: str
+    score: int
+    played_at: float
+    seed: Optional[int] = None
+    duration: Optional[int] = None  # тики симуляции
+    pipes: Optional[int] = None     # пройдено труб
+
+
+def connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class ScoreDB:
+    """История игр; add() не блокирует, запросы читают из базы."""
+
+    def __init__(self, path: str = "scores.db", batch: int = 256, delay: float = 1.0) -> None:
+        self.path = path
+        self.batch = batch
+        self.delay = delay
+        self._conn = connect(path)
+        self._read_lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[Run]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._writer, name="score-db-writer", daemon=True)
+        self._thread.start()
+
+    def add(self, player: str, score: int, seed: Optional[int] = None,
+            duration: Optional[int] = None, pipes: Optional[int] = None) -> None:
+        """Поставить игру в очередь на запись."""
+        self._queue.put(Run(player, score, time.time(), seed, duration, pipes))
+
+    def _writer(self) -> None:
+        # Своё соединение: запись не мешает чтению из игрового потока
+        conn = connect(self.path)
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            rows = []
+            deadline = time.monotonic() + self.delay
+            while True:
+                if item is None:
+                    stop = True
+                    break
+                rows.append(item)
+                if len(rows) >= self.batch:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            if rows:
+                insert_runs(conn, rows)
+        conn.close()
+
+    def close(self) -> None:
+        """Дописать очередь и закрыть базу."""
+        self._queue.put(None)
+        self._thread.join()
+        self._conn.close()
+
+    def _query(self, sql: str, args: tuple = ()) -> list:
+        with self._read_lock:
+            return self._conn.execute(sql, args).fetchall()
+
+    def top(self, n: int = 5) -> List[Tuple[str, int]]:
+        """Лучшие n игр за всё время."""
+        return self._query("SELECT player, score FROM runs ORDER BY score DESC, id LIMIT ?", (n,))
+
+    def player_best(self, player: str) -> Optional[int]:
+        """Лучший счёт игрока или None, если он ещё не играл."""
+        row = self._query("SELECT MAX(score) FROM runs WHERE player = ?", (player,))[0]
+        return row[0]
+
+    def best_per_player(self, n: int = 5) -> List[Tuple[str, int]]:
+        """Топ игроков по их лучшему результату."""
+        return self._query(
+            "SELECT player, MAX(score) AS best FROM runs GROUP BY player ORDER BY best DESC LIMIT ?", (n,)
+        )
+
+    def percentile(self, score: int) -> float:
+        """Доля игр (0..100) со счётом строго меньше score."""
+        below, total = self._query(
+            "SELECT (SELECT COUNT(*) FROM runs WHERE score < ?), (SELECT COUNT(*) FROM runs)", (score,)
+        )[0]
+        return 100.0 * below / total if total else 0.0
+
+    def score_at(self, pct: float) -> Optional[int]:
+        """Счёт на заданном перцентиле (0..100)."""
+        total = self._query("SELECT COUNT(*) FROM runs")[0][0]
+        if not total:
+            return None
+        offset = min(total - 1, int(total * pct / 100))
+        return self._query("SELECT score FROM runs ORDER BY score LIMIT 1 OFFSET ?", (offset,))[0][0]
+
+
+def insert_runs(conn: sqlite3.Connection, rows: List[Run]) -> None:
+    with conn:
+        conn.executemany(
+            "INSERT INTO runs (player, score, played_at, seed, duration, pipes) VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+
+def import_records(records_path: str, db_path: str) -> int:
+    """Перенести рекорды из records.txt в базу; возвращает число строк.
+
+    Старые рекорды пишутся с played_at = 0. Если такие строки в базе уже
+    есть, перенос был, и повторный запуск ничего не добавляет (возвращает 0).
+    """
+    rows = [Run(name, score, 0.0, pipes=score) for name, score in read_records(records_path)]
+    conn = connect(db_path)
+    try:
+        if conn.execute("SELECT 1 FROM runs WHERE played_at = 0 LIMIT 1").fetchone():
+            return 0
+        insert_runs(conn, rows)
+    finally:
+        conn.close()
+    return len(rows)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="История игр Flappy bird в SQLite")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="перенести records.txt в базу")
+    imp.add_argument("records")
+    imp.add_argument("db", nargs="?", default="scores.db")
+    top = sub.add_parser("top", help="показать лучшие игры")
+    top.add_argument("db", nargs="?", default="scores.db")
+    top.add_argument("-n", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        print(f"импортировано: {import_records(args.records, args.db)}")
+    else:
+        conn = connect(args.db)
+        for i, (player, score) in enumerate(
+            conn.execute("SELECT player, score FROM runs ORDER BY score DESC LIMIT ?", (args.n,)), 1
+        ):
+            print(f"{i}. {player} - {score}")
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
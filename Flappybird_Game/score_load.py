@@ -0,0 +1,112 @@
+"""Нагрузочный прогон: тысячи имитированных автоматов против score_server.
+
+Все клиенты — ScoreClient в одном цикле asyncio; каждый «заканчивает игру»
+в среднем раз в --game-seconds секунд. По умолчанию сервер поднимается в
+этом же процессе на свободном порту, --server хост:порт — внешний.
+Заодно меряется задержка «кадра» (sleep на 1/60 с) — она показывает,
+не тормозит ли отправка игровой цикл.
+
+    python score_load.py --clients 2000 --duration 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from typing import List, Optional
+
+from score_client import ScoreClient
+from score_server import ScoreServer
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def raise_fd_limit() -> None:
+    """Тысячам соединений нужно столько же дескрипторов (и столько же у сервера)."""
+    if resource is not None:
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if soft < hard:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+async def cabinet(client: ScoreClient, game_seconds: float, until: float, rng: random.Random) -> int:
+    """Один автомат: отправляет результаты до момента until."""
+    client.start()
+    games = 0
+    while True:
+        await asyncio.sleep(min(rng.expovariate(1 / game_seconds), max(0.0, until - time.monotonic())))
+        if time.monotonic() >= until:
+            return games
+        client.submit(f"cab{client.client_id[:4]}", rng.randint(0, 60), seed=rng.getrandbits(32))
+        games += 1
+
+
+async def frame_lag(until: float) -> List[float]:
+    """Насколько позже срока просыпается «кадр» длиной 1/60 с, мс."""
+    lags = []
+    while time.monotonic() < until:
+        start = time.perf_counter()
+        await asyncio.sleep(1 / 60)
+        lags.append((time.perf_counter() - start) * 1000 - 1000 / 60)
+    return lags
+
+
+async def run(args: argparse.Namespace) -> int:
+    server = None
+    if args.server:
+        host, _, port = args.server.rpartition(":")
+        port = int(port)
+    else:
+        server = ScoreServer()
+        host, port = "127.0.0.1", await server.start("127.0.0.1", 0)
+
+    rng = random.Random(args.seed)
+    clients = [ScoreClient(host, port, interval=args.interval) for _ in range(args.clients)]
+    start = time.monotonic()
+    until = start + args.duration
+    tasks = [asyncio.create_task(cabinet(c, args.game_seconds, until, random.Random(rng.random())))
+             for c in clients]
+    lags = await frame_lag(until)
+    games = sum(await asyncio.gather(*tasks))
+    await asyncio.gather(*(c.close(timeout=args.interval * 3) for c in clients))
+    elapsed = time.monotonic() - start
+
+    sent = sum(c.sent for c in clients)
+    lost = sum(c.pending for c in clients)
+    lags.sort()
+    print(f"клиентов {args.clients}, {elapsed:.1f} с: игр {games}, отправлено {sent}, "
+          f"не отправлено {lost}, ошибок {sum(c.failures for c in clients)}")
+    print(f"пропускная способность {sent / elapsed:.0f} игр/с")
+    if lags:
+        print(f"опоздание кадра: p50 {lags[len(lags) // 2]:.2f} мс, "
+              f"p99 {lags[int(len(lags) * 0.99)]:.2f} мс, max {lags[-1]:.2f} мс")
+    if server is not None:
+        print(f"сервер: сохранено {server.stored}, пачек {server.batches}, повторов {server.duplicates}, "
+              f"битых {server.rejected}")
+        await server.close()
+        if server.stored != games:
+            return 1
+    return 1 if lost else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--duration", type=float, default=15.0, help="секунд нагрузки")
+    parser.add_argument("--game-seconds", type=float, default=2.0, help="средняя длина игры, с")
+    parser.add_argument("--interval", type=float, default=3.0, help="период отправки клиента, с")
+    parser.add_argument("--server", help="хост:порт внешнего сервера (по умолчанию — свой)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    raise_fd_limit()
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""Эталонный сервер рекордов для score_client.ScoreClient.
+
+Один процесс asyncio, по задаче на соединение. Игры из пачки проверяются,
+повторные uid отбрасываются (клиент повторяет пачку, если не дождался
+ответа), битые — тоже, с пометкой "rejected" в ответе; остальные пишутся в ScoreDB (фоновый поток, пачками) или, без
+--db, только считаются в памяти — для нагрузочных прогонов.
+
+Кроме пачек понимает {"id": n, "top": 5} -> {"id": n, "top": [[имя, очки], ...]}.
+
+    python score_server.py --db scores.db
+    python score_load.py --clients 2000    # нагрузка на локальный сервер
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from score_client import DEFAULT_PORT
+from score_db import Run, ScoreDB
+
+MAX_LINE = 1 << 20      # предел одного сообщения, байт
+SEEN_LIMIT = 1_000_000  # сколько последних uid помнить для отсева повторов
+
+
+class ScoreServer:
+    """Приём пачек результатов по JSON-строкам."""
+
+    def __init__(self, db: Optional[ScoreDB] = None) -> None:
+        self.db = db
+        self.stored = 0
+        self.duplicates = 0
+        self.rejected = 0
+        self.batches = 0
+        self.connections = 0
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._best: List[Tuple[str, int]] = []
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> int:
+        """Начать слушать; возвращает фактический порт (port=0 — любой свободный)."""
+        self._server = await asyncio.start_server(self._handle, host, port, limit=MAX_LINE, backlog=4096)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self.db is not None:
+            self.db.close()
+
+    @staticmethod
+    def parse_run(item: dict) -> Tuple[str, Run]:
+        """(uid, Run) из элемента пачки; ValueError/KeyError/TypeError, если он битый."""
+        uid = item["uid"]
+        player = item["player"]
+        if not isinstance(uid, (str, int)) or not isinstance(player, str):
+            raise TypeError("uid и player должны быть строками")
+        for key in ("seed", "duration"):
+            if item.get(key) is not None and not isinstance(item[key], int):
+                raise TypeError(f"{key} должен быть целым")
+        return str(uid), Run(player, int(item["score"]), float(item.get("played_at") or time.time()),
+                             item.get("seed"), item.get("duration"))
+
+    def store(self, runs: list) -> Tuple[int, int]:
+        """Сохранить новые игры из пачки; возвращает (записано, отброшено битых).
+
+        Пачка сначала разбирается целиком и только потом запоминаются uid:
+        битый элемент не должен оставить пачку записанной наполовину.
+        """
+        if not isinstance(runs, list):
+            raise TypeError("runs должен быть списком")
+        parsed = []
+        rejected = 0
+        for item in runs:
+            try:
+                parsed.append(self.parse_run(item))
+            except (ValueError, KeyError, TypeError):
+                rejected += 1
+        stored = 0
+        for uid, run in parsed:
+            if uid in self._seen:
+                self.duplicates += 1
+                continue
+            self._seen[uid] = None
+            if len(self._seen) > SEEN_LIMIT:
+                self._seen.popitem(last=False)
+            if self.db is not None:
+                self.db.add(run.player, run.score, run.seed, run.duration)
+            self._best = sorted(self._best + [(run.player, run.score)], key=lambda r: -r[1])[:100]
+            stored += 1
+        self.stored += stored
+        self.rejected += rejected
+        self.batches += 1
+        return stored, rejected
+
+    def top(self, n: int) -> List[Tuple[str, int]]:
+        if self.db is not None:
+            return [tuple(r) for r in self.db.top(n)]
+        return self._best[:n]
+
+    def _reply(self, message: dict) -> dict:
+        if "runs" in message:
+            stored, rejected = self.store(message["runs"])
+            reply = {"id": message.get("id"), "stored": stored}
+            if rejected:
+                # Не ошибка: повтор пачки ничего не исправит, клиент её отпускает
+                reply["rejected"] = rejected
+            return reply
+        if "top" in message:
+            return {"id": message.get("id"), "top": self.top(int(message["top"]))}
+        return {"id": message.get("id"), "error": "unknown request"}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Строка длиннее лимита потока: ответить и закрыть — остаток строки не разобрать
+                    writer.write(json.dumps({"error": "request too long"}).encode("utf-8") + b"\n")
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                try:
+                    reply = self._reply(json.loads(line))
+                except (ValueError, KeyError, TypeError) as exc:
+                    reply = {"error": f"bad request: {exc}"}
+                writer.write(json.dumps(reply, ensure_ascii=False).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (OSError, asyncio.LimitOverrunError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+
+async def serve(host: str, port: int, db_path: Optional[str]) -> None:
+    server = ScoreServer(ScoreDB(db_path) if db_path else None)
+    port = await server.start(host, port)
+    print(f"сервер рекордов на {host}:{port}", flush=True)
+    try:
+        while True:
+            await asyncio.sleep(10)
+            print(f"соединений {server.connections}, пачек {server.batches}, "
+                  f"игр {server.stored}, повторов {server.duplicates}", flush=True)
+    finally:
+        await server.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--db", help="файл SQLite (по умолчанию — только в памяти)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.db))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""Безоконная детерминированная модель Flappy bird.
+
+Физика, появление труб, столкновения и очки — ровно как в цикле main.py,
+но без дисплея и реального времени: один вызов step() — один тик
+фиксированной длины 1/fps. Трубы появляются по пройденному расстоянию,
+поэтому ход игры не зависит от частоты кадров отрисовки.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Iterator, NamedTuple, Optional, Tuple
+
+from course import Course
+from pipes import PipeRing
+
+# Размеры кадров птицы (Bird4/Bird5/Bird8.png) и трубы (pipe_ts.png)
+BIRD_SIZES: Tuple[Tuple[int, int], ...] = ((62, 57), (60, 55), (60, 56))
+PIPE_SIZE: Tuple[int, int] = (200, 600)
+
+
+@dataclass(frozen=True)
+class FlappyConfig:
+    """Параметры сложности и геометрии (значения по умолчанию — из main.py)."""
+
+    width: int = 1200
+    height: int = 600
+    fps: int = 60
+    gravity: float = 0.3
+    flap_speed: float = -6
+    bird_x: int = 50
+    pipe_gap: int = 125
+    pipe_speed: int = 10
+    pipe_frequency: int = 1000  # мс между трубами
+    gap_margin: int = 100       # отступ зазора от краёв экрана
+    anim_step: float = 0.4
+    pixel_collision: bool = True  # маски (collision.py) вместо урезанных прямоугольников
+
+    @property
+    def spawn_ticks(self) -> int:
+        """Период появления труб в кадрах."""
+        return max(1, round(self.pipe_frequency * self.fps / 1000))
+
+    @property
+    def spawn_distance(self) -> float:
+        """Расстояние прокрутки между соседними трубами, пиксели."""
+        return self.pipe_speed * self.spawn_ticks
+
+    def pipe_capacity(self, pipe_width: int) -> int:
+        """Сколько труб одновременно может быть на экране (с запасом)."""
+        return math.ceil((self.width + pipe_width) / max(1e-9, self.spawn_distance)) + 2
+
+
+class SimState(NamedTuple):
+    """Снимок состояния симуляции."""
+
+    tick: int
+    bird_y: float
+    bird_speed: float
+    bird_index: float
+    score: int
+    alive: bool
+    pipes: Tuple[Tuple[float, int, bool], ...]  # (x, y зазора, пройдена)
+
+
+class FlappySim:
+    """Одна игра: reset(seed), step(flap) и snapshot()."""
+
+    def __init__(
+        self,
+        config: Optional[FlappyConfig] = None,
+        bird_sizes: Tuple[Tuple[int, int], ...] = BIRD_SIZES,
+        pipe_size: Tuple[int, int] = PIPE_SIZE,
+        masks=None,
+    ) -> None:
+        self.config = config or FlappyConfig()
+        self.masks = None
+        if self.config.pixel_collision:
+            from collision import default_masks
+
+            self.masks = masks or default_masks()
+            bird_sizes, pipe_size = self.masks.bird_sizes, self.masks.pipe_size
+        self.bird_sizes = bird_sizes
+        self.pipe_width, self.pipe_height = pipe_size
+        self.pipes = PipeRing(self.config.pipe_capacity(self.pipe_width))
+        self.reset()
+
+    def reset(self, seed: Optional[int] = None) -> None:
+        """Начать новую игру; одинаковый seed даёт одинаковые трубы."""
+        self.seed = seed
+        self.course = Course(seed, self.config)
+        self.spawned = 0  # номер следующей трубы трассы
+        self.tick = 0
+        self.bird_y: float = self.config.height // 2
+        self.bird_speed: float = 0
+        self.bird_index: float = 0
+        self.score = 0
+        self.alive = True
+        self.scroll: float = 0  # сколько пикселей прокрутил мир
+        self.next_spawn: float = self.config.spawn_distance
+        # Состояние предыдущего тика — для интерполяции при отрисовке
+        self.prev_bird_y = self.bird_y
+        self.prev_scroll = self.scroll
+        self.pipes.clear()
+
+    def spawn_pipe(self) -> None:
+        self.pipes.push(self.scroll + self.config.width, self.course.gap(self.spawned))
+        self.spawned += 1
+
+    def iter_pipes(self, alpha: float = 1.0) -> Iterator[Tuple[float, int, bool]]:
+        """(экранная x, y зазора, пройдена) для труб на экране, слева направо.
+
+        alpha in [0, 1] — доля пути от прошлого тика к текущему (для отрисовки).
+        """
+        return self.pipes.items(self.prev_scroll + (self.scroll - self.prev_scroll) * alpha)
+
+    def bird_y_at(self, alpha: float = 1.0) -> float:
+        """Высота птицы между прошлым и текущим тиком."""
+        return self.prev_bird_y + (self.bird_y - self.prev_bird_y) * alpha
+
+    @property
+    def bird_size(self) -> Tuple[int, int]:
+        return self.bird_sizes[int(self.bird_index)]
+
+    def step(self, flap: bool = False) -> bool:
+        """Продвинуть игру на один кадр. Возвращает True, пока птица жива."""
+        if not self.alive:
+            return False
+        cfg = self.config
+        self.tick += 1
+        self.prev_bird_y = self.bird_y
+        self.prev_scroll = self.scroll
+        # Сначала ввод и появление трубы, затем физика
+        if flap:
+            self.bird_speed = cfg.flap_speed
+        if self.scroll + cfg.pipe_speed >= self.next_spawn:
+            self.spawn_pipe()
+            self.next_spawn += cfg.spawn_distance
+
+        self.bird_speed += cfg.gravity
+        self.bird_y += self.bird_speed
+        self.bird_index += cfg.anim_step
+        if self.bird_index >= len(self.bird_sizes):
+            self.bird_index = 0
+        if self.bird_y > cfg.height:
+            self.alive = False
+
+        bird_w, bird_h = self.bird_size
+        bx, by = cfg.bird_x, int(self.bird_y)
+        pw, ph = self.pipe_width, self.pipe_height
+        ring = self.pipes
+        self.scroll += cfg.pipe_speed
+        ring.drop_before(self.scroll - pw)
+        # Трубы упорядочены по x: смотрим только те, что левее правого края птицы
+        for slot in ring.slots():
+            x = ring.world_x[slot] - self.scroll
+            if x >= bx + bird_w:
+                break
+            px = int(x)
+            top_y = ring.gap_y[slot] - ph
+            bottom_y = ring.gap_y[slot] + cfg.pipe_gap
+            if self.masks is not None:
+                if self.masks.hits(int(self.bird_index), bx, by, px, top_y, bottom_y):
+                    self.alive = False
+            elif bx < px + pw - 5:
+                if (by < top_y + ph - 5 and top_y < by + bird_h) or (
+                    by < bottom_y + ph - 5 and bottom_y < by + bird_h
+                ):
+                    self.alive = False
+            if x + pw < bx and not ring.is_passed(slot):
+                self.score += 1
+                ring.mark_passed(slot)
+        return self.alive
+
+    def snapshot(self) -> SimState:
+        """Неизменяемый снимок текущего состояния."""
+        return SimState(
+            self.tick,
+            self.bird_y,
+            self.bird_speed,
+            self.bird_index,
+            self.score,
+            self.alive,
+            tuple(self.iter_pipes()),
+        )
@@ -0,0 +1,9 @@
+"""Модули игры лежат плоско в Flappybird_Game/ — добавить его в sys.path."""
+
+import os
+import sys
+
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, GAME_DIR)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
@@ -0,0 +1,46 @@
+"""Ленивые файлы веб-сборки: попадают в build_web и переживают 404 в fetch()."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import types
+
+import pytest
+
+import assets
+from build_web import local_modules, referenced_assets
+
+
+def test_lazy_files_are_built():
+    assert set(assets.LAZY) <= set(referenced_assets(local_modules()))
+
+
+class _Missing:
+    """platform.fopen из pygbag для файла, которого нет на сервере."""
+
+    def __init__(self, url, mode):
+        self.url = url
+
+    async def __aenter__(self):
+        raise FileNotFoundError(self.url)
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def browser(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "platform", "emscripten")
+    monkeypatch.setitem(sys.modules, "platform", types.SimpleNamespace(fopen=_Missing))
+
+
+def test_missing_optional_file_is_skipped(browser, capsys):
+    asyncio.run(assets.fetch(["autopilot.bin"]))
+    assert "autopilot.bin" in capsys.readouterr().out
+
+
+def test_missing_sprite_fails(browser):
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(assets.fetch(["Bird4.png"]))
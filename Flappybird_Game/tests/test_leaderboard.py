@@ -0,0 +1,45 @@
+"""leaderboard.py: серия результатов сохраняется одной записью."""
+
+from __future__ import annotations
+
+import time
+
+from leaderboard import Leaderboard, read_records
+
+
+def count_writes(monkeypatch, board: Leaderboard) -> list:
+    writes = []
+    persist = board._persist
+
+    def counted(pending):
+        writes.append(list(pending))
+        persist(pending)
+
+    monkeypatch.setattr(board, "_persist", counted)
+    return writes
+
+
+def test_burst_is_one_write(tmp_path, monkeypatch):
+    path = str(tmp_path / "records.txt")
+    board = Leaderboard(path, limit=20, delay=0.5, background=True)
+    writes = count_writes(monkeypatch, board)
+    for i in range(10):
+        board.submit(f"p{i}", i)
+        time.sleep(0.01)
+    time.sleep(0.8)
+    assert len(writes) == 1 and len(writes[0]) == 10
+    board.close()
+    assert len(writes) == 1
+    assert sorted(read_records(path)) == sorted((f"p{i}", i) for i in range(10))
+
+
+def test_close_writes_pending_without_waiting(tmp_path, monkeypatch):
+    path = str(tmp_path / "records.txt")
+    board = Leaderboard(path, delay=30, background=True)
+    writes = count_writes(monkeypatch, board)
+    board.submit("a", 3)
+    start = time.monotonic()
+    board.close()
+    assert time.monotonic() - start < 5
+    assert sum(len(w) for w in writes) == 1
+    assert read_records(path) == [("a", 3)]
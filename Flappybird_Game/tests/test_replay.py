@@ -0,0 +1,135 @@
+"""Формат реплеев (replay.py) и совпадение BatchSim с FlappySim."""
+
+from __future__ import annotations
+
+import random
+import zlib
+from dataclasses import astuple, replace
+
+import numpy as np
+import pytest
+
+import replay as rp
+from batch_sim import BatchSim
+from sim import FlappyConfig, FlappySim
+from tune import scripted_policy
+
+CUSTOM = FlappyConfig(pipe_gap=150, pipe_speed=8, pixel_collision=False)
+
+
+def record(config: FlappyConfig, seed: int, ticks: int = 3000) -> rp.Replay:
+    """Сыграть scripted-политикой из tune.py и записать реплей, как это делает main.py."""
+    sim = FlappySim(config)
+    sim.reset(seed)
+    recorder = rp.ReplayRecorder(sim)
+    rng = random.Random(seed)
+    while sim.alive and sim.tick < ticks:
+        flap = scripted_policy(sim, rng)
+        sim.step(flap)
+        recorder.after_step(flap)
+    return recorder.replay
+
+
+def encode_v1(replay: rp.Replay, with_config: bool) -> bytes:
+    """Реплей версии 1 — так его писал replay.py до столкновений по маскам."""
+    out = bytearray(rp.HEADER.pack(rp.MAGIC, 1, rp.FLAG_CONFIG if with_config else 0,
+                                   replay.seed, replay.ticks, replay.score))
+    if with_config:
+        out += rp.CONFIG_FORMAT_V1.pack(*astuple(replay.config)[:-1])
+    rp._write_varint(out, len(replay.flaps))
+    prev = 0
+    for tick in replay.flaps:
+        rp._write_varint(out, tick - prev)
+        prev = tick
+    out += rp.CRC.pack(zlib.crc32(out))
+    return bytes(out)
+
+
+@pytest.mark.parametrize("config", [FlappyConfig(), CUSTOM], ids=["default", "custom"])
+def test_round_trip(config):
+    original = record(config, 42)
+    assert original.flaps and original.score > 0
+    decoded = rp.decode(rp.encode(original))
+    assert decoded == original
+    assert decoded.version == rp.VERSION
+    assert rp.simulate(decoded).score == original.score
+
+
+def test_config_block_only_when_custom():
+    default = rp.encode(record(FlappyConfig(), 42))
+    custom = rp.encode(record(CUSTOM, 42))
+    assert rp.HEADER.unpack_from(default)[2] == 0
+    assert rp.HEADER.unpack_from(custom)[2] == rp.FLAG_CONFIG
+
+
+@pytest.mark.parametrize("with_config", [False, True], ids=["default", "custom"])
+def test_decode_v1(with_config):
+    config = replace(CUSTOM if with_config else FlappyConfig(), pixel_collision=False)
+    original = record(config, 5)
+    decoded = rp.decode(encode_v1(original, with_config))
+    assert decoded.version == 1
+    # Версия 1 всегда переигрывается на прямоугольных столкновениях
+    assert decoded.config == config
+    assert (decoded.seed, decoded.flaps, decoded.ticks, decoded.score) == (
+        original.seed, original.flaps, original.ticks, original.score)
+    assert rp.simulate(decoded).score == original.score
+
+
+def test_stream_round_trip(tmp_path):
+    replays = [record(FlappyConfig(), seed) for seed in range(3)]
+    path = tmp_path / "day.flrs"
+    with open(path, "wb") as f:
+        for r in replays:
+            rp.write_stream(f, r)
+    with open(path, "rb") as f:
+        assert [rp.decode(data) for data in rp.iter_stream(f)] == replays
+
+
+def test_flipped_byte_fails_crc():
+    data = rp.encode(record(CUSTOM, 42))
+    for pos in range(len(data)):
+        corrupt = bytearray(data)
+        corrupt[pos] ^= 0x01
+        with pytest.raises(rp.ReplayError):
+            rp.decode(bytes(corrupt))
+
+
+def test_truncated_and_foreign_data_rejected():
+    data = rp.encode(record(FlappyConfig(), 42))
+    with pytest.raises(rp.ReplayError):
+        rp.decode(data[:-1])
+    with pytest.raises(rp.ReplayError):
+        rp.decode(data[:rp.HEADER.size])
+    with pytest.raises(rp.ReplayError):
+        rp.decode(b"\x89PNG" + data[4:])
+
+
+@pytest.mark.parametrize("pixel_collision", [True, False], ids=["masks", "rects"])
+@pytest.mark.parametrize("seed", [0, 1, 7, 42, 12345])
+def test_batch_sim_matches_flappy_sim(seed, pixel_collision):
+    config = FlappyConfig(pixel_collision=pixel_collision)
+    n, max_ticks = 24, 1500
+    rng = np.random.default_rng(seed)
+    # У каждой птицы своя частота нажатий: от «почти не прыгает» до «прыгает часто»
+    flaps = rng.random((max_ticks, n)) < np.linspace(0.02, 0.2, n)
+    # Первую птицу ведёт scripted-политика — чтобы был ненулевой счёт
+    flaps[:, 0] = False
+    flaps[[t - 1 for t in record(config, seed, max_ticks).flaps], 0] = True
+
+    batch = BatchSim(n, config)
+    batch.reset(seed)
+    for t in range(max_ticks):
+        if not batch.step(flaps[t]).any():
+            break
+
+    for i in range(n):
+        sim = FlappySim(config)
+        sim.reset(seed)
+        while sim.tick < max_ticks and sim.step(bool(flaps[sim.tick, i])):
+            pass
+        assert batch.score[i] == sim.score, f"птица {i}"
+        assert bool(batch.alive[i]) == sim.alive, f"птица {i}"
+        if not sim.alive:
+            assert batch.death_tick[i] == sim.tick, f"птица {i}"
+        assert batch.bird_y[i] == sim.bird_y, f"птица {i}"
+    assert batch.score[0] > 0
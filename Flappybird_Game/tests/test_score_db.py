@@ -0,0 +1,30 @@
+"""score_db.py: перенос records.txt выполняется один раз."""
+
+from __future__ import annotations
+
+import sqlite3
+
+from score_db import Run, connect, import_records, insert_runs
+
+
+def count(db_path) -> int:
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_import_records_is_idempotent(tmp_path):
+    records = tmp_path / "records.txt"
+    records.write_text("ann,12\nbob,7\nc,d,3\n", encoding="utf-8")
+    db = str(tmp_path / "scores.db")
+    # Игры, сыгранные до переноса, не мешают ему
+    conn = connect(db)
+    insert_runs(conn, [Run("eve", 20, 1_700_000_000.0)])
+    conn.close()
+
+    assert import_records(str(records), db) == 3
+    assert count(db) == 4
+    assert import_records(str(records), db) == 0
+    assert count(db) == 4
@@ -0,0 +1,68 @@
+"""score_server.py и score_client.py: битые игры в пачке не повторяются вечно."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+from score_client import ScoreClient
+from score_server import ScoreServer
+
+GOOD = {"uid": "a-1", "player": "ann", "score": 3}
+BAD = {"uid": "a-2", "player": "bob", "score": "много"}
+GOOD2 = {"uid": "a-3", "player": "cid", "score": 5}
+
+
+async def request(port: int, message: dict) -> dict:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(json.dumps(message).encode("utf-8") + b"\n")
+    line = await reader.readline()
+    writer.close()
+    return json.loads(line)
+
+
+def test_bad_item_is_rejected_without_failing_batch():
+    async def scenario():
+        server = ScoreServer()
+        port = await server.start(port=0)
+        try:
+            first = await request(port, {"id": 1, "runs": [GOOD, BAD, GOOD2]})
+            again = await request(port, {"id": 2, "runs": [GOOD, BAD, GOOD2]})
+            return server, first, again
+        finally:
+            await server.close()
+
+    server, first, again = asyncio.run(scenario())
+    assert first == {"id": 1, "stored": 2, "rejected": 1}
+    assert again == {"id": 2, "stored": 0, "rejected": 1}
+    assert server.stored == 2 and server.duplicates == 2
+    assert sorted(server.top(5)) == [("ann", 3), ("cid", 5)]
+
+
+def test_bad_item_does_not_record_uids():
+    server = ScoreServer()
+    # Элемент без uid: пачка целиком разбирается до того, как запомнен хоть один uid
+    stored, rejected = server.store([GOOD, {"player": "x", "score": 1}, GOOD2])
+    assert (stored, rejected) == (2, 1)
+    assert server.store([dict(BAD, score=7)]) == (1, 0)
+
+
+def test_client_drops_rejected_runs():
+    async def scenario():
+        server = ScoreServer()
+        port = await server.start(port=0)
+        client = ScoreClient(port=port, interval=0.05, backoff=0.01)
+        client.start()
+        client.submit("ann", 3)
+        client._queue.append(dict(BAD))  # submit() такое не пропустит — подмешиваем напрямую
+        client.submit("cid", 5)
+        await asyncio.sleep(0.5)
+        await client.close()
+        await server.close()
+        return server, client
+
+    server, client = asyncio.run(scenario())
+    assert client.pending == 0
+    assert client.failures == 0
+    assert client.rejected == 1
+    assert server.stored == 2
@@ -0,0 +1,136 @@
+"""FlappySim детерминирована и играет так же, как цикл main.py до выноса модели."""
+
+from __future__ import annotations
+
+import os
+import random
+from typing import List
+
+import pygame
+import pytest
+
+from conftest import GAME_DIR
+from sim import FlappyConfig, FlappySim
+from tune import scripted_policy
+
+TICKS = 3000
+
+
+def policy_flaps(config: FlappyConfig, seed: int, ticks: int = TICKS) -> List[bool]:
+    """Нажатия scripted-политики за одну игру — фиксированный ввод для проверок."""
+    sim = FlappySim(config)
+    sim.reset(seed)
+    rng = random.Random(seed)
+    flaps: List[bool] = []
+    while sim.alive and sim.tick < ticks:
+        flap = scripted_policy(sim, rng)
+        flaps.append(flap)
+        sim.step(flap)
+    return flaps
+
+
+def play(config: FlappyConfig, seed: int, flaps: List[bool]) -> FlappySim:
+    sim = FlappySim(config)
+    sim.reset(seed)
+    for flap in flaps:
+        if not sim.step(flap):
+            break
+    return sim
+
+
+def reference_play(seed: int, flaps: List[bool]):
+    """Ветка 'play' цикла main.py до выноса FlappySim, почти дословно.
+
+    Отличия от оригинала только во входе: SPAWNPIPE-таймер (1000 мс при
+    60 FPS) заменён счётчиком кадров, random.randint — random.Random(seed),
+    пробел — списком flaps. Возвращает (кадров, очки, bird_y, bird_speed, трубы).
+    """
+    WIDTH, HEIGHT = 1200, 600
+    bird_images = [pygame.image.load(os.path.join(GAME_DIR, name)) for name in ("Bird4.png", "Bird5.png", "Bird8.png")]
+    pipe_image = pygame.image.load(os.path.join(GAME_DIR, "pipe_ts.png"))
+    pipe_width = pipe_image.get_width()
+    pipe_height = pipe_image.get_height()
+    rng = random.Random(seed)
+
+    bird_index = 0
+    bird_speed = 0
+    gravity = 0.3
+    bird_x = 50
+    bird_y = HEIGHT // 2
+    game_active = True
+    score = 0
+    pipes = []
+    pipe_gap = 125
+    pipe_speed = 10
+
+    frame = 0
+    for flap in flaps:
+        frame += 1
+        if flap:
+            bird_speed = -6
+        if frame % 60 == 0:
+            pipe_y = rng.randint(100, HEIGHT - 100 - pipe_gap)
+            pipes.append({"x": WIDTH, "y": pipe_y, "passed": False})
+
+        bird_speed += gravity
+        bird_y += bird_speed
+        bird_index += 0.4
+        if bird_index >= len(bird_images):
+            bird_index = 0
+        current_bird = bird_images[int(bird_index)]
+        if bird_y > HEIGHT:
+            game_active = False
+        bird_rect = pygame.Rect(bird_x, bird_y, current_bird.get_width(), current_bird.get_height())
+        for pipe in pipes:
+            pipe["x"] -= pipe_speed
+        pipes = [pipe for pipe in pipes if pipe["x"] + pipe_width > 0]
+        for pipe in pipes:
+            top_pipe_rect = pygame.Rect(pipe["x"], pipe["y"] - pipe_height, pipe_width - 5, pipe_height - 5)
+            bottom_pipe_rect = pygame.Rect(pipe["x"], pipe["y"] + pipe_gap, pipe_width - 5, pipe_height - 5)
+            if bird_rect.colliderect(top_pipe_rect) or bird_rect.colliderect(bottom_pipe_rect):
+                game_active = False
+            if pipe["x"] + pipe_width < bird_x and not pipe["passed"]:
+                score += 1
+                pipe["passed"] = True
+        if not game_active:
+            break
+    return frame, score, bird_y, bird_speed, tuple((p["x"], p["y"], p["passed"]) for p in pipes)
+
+
+@pytest.mark.parametrize("pixel_collision", [False, True])
+@pytest.mark.parametrize("seed", [0, 7, 12345])
+def test_same_seed_and_flaps_replay_identically(seed, pixel_collision):
+    config = FlappyConfig(pixel_collision=pixel_collision)
+    flaps = policy_flaps(config, seed)
+    first, second = play(config, seed, flaps), play(config, seed, flaps)
+    assert first.score == second.score
+    assert first.tick == second.tick
+    assert first.snapshot() == second.snapshot()
+
+
+def test_reset_restarts_the_same_game():
+    config = FlappyConfig()
+    flaps = policy_flaps(config, 3)
+    sim = play(config, 3, flaps)
+    before = sim.snapshot()
+    sim.reset(3)
+    for flap in flaps:
+        if not sim.step(flap):
+            break
+    assert sim.snapshot() == before
+
+
+@pytest.mark.parametrize("seed", [0, 7, 12345])
+def test_matches_pre_refactor_main_loop(seed):
+    # До выноса в main.py были урезанные прямоугольники, а не маски
+    config = FlappyConfig(pixel_collision=False)
+    flaps = policy_flaps(config, seed)
+    sim = play(config, seed, flaps)
+    frames, score, bird_y, bird_speed, pipes = reference_play(seed, flaps)
+    assert score > 0, "ввод должен проводить птицу хотя бы через одну трубу"
+    assert sim.tick == frames
+    assert sim.score == score
+    assert not sim.alive
+    assert sim.bird_y == bird_y
+    assert sim.bird_speed == bird_speed
+    assert tuple(sim.iter_pipes()) == pipes
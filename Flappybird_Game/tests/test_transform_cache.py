@@ -0,0 +1,40 @@
+"""transform_cache.py: обратная запись отражения не занимает места в кэше."""
+
+from __future__ import annotations
+
+import pygame
+
+from transform_cache import TransformCache, surface_bytes
+
+
+def surface(w: int = 64, h: int = 32) -> pygame.Surface:
+    return pygame.Surface((w, h), 0, 32)
+
+
+def test_flip_of_flip_is_source():
+    cache = TransformCache()
+    a = surface()
+    flipped = cache.flip(a, True, False)
+    assert flipped is not a
+    assert cache.flip(flipped, True, False) is a
+    assert cache.flip(a, True, False) is flipped
+
+
+def test_inverse_entry_is_not_counted():
+    cache = TransformCache()
+    a = surface()
+    flipped = cache.flip(a, False, True)
+    assert cache.bytes == surface_bytes(flipped)
+
+
+def test_inverse_goes_with_forward_entry():
+    a, b = surface(), surface()
+    one = surface_bytes(a)
+    cache = TransformCache(max_bytes=one)
+    flipped = cache.flip(a, True, False)
+    cache.flip(b, True, False)  # не помещается вместе с первым — первый выброшен
+    assert cache.bytes == one
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    # Ни прямой, ни обратной записи для a не осталось
+    assert cache.flip(flipped, True, False) is not a
@@ -0,0 +1,56 @@
+"""verify_replays.py: битые данные — отдельные ошибки, а не падение прогона."""
+
+from __future__ import annotations
+
+import json
+import random
+
+import replay as rp
+import verify_replays
+from sim import FlappyConfig, FlappySim
+from tune import scripted_policy
+
+
+def record(seed: int) -> rp.Replay:
+    sim = FlappySim(FlappyConfig())
+    sim.reset(seed)
+    recorder = rp.ReplayRecorder(sim)
+    rng = random.Random(seed)
+    while sim.alive and sim.tick < 2000:
+        flap = scripted_policy(sim, rng)
+        sim.step(flap)
+        recorder.after_step(flap)
+    return recorder.replay
+
+
+def run(capsys, *argv):
+    code = verify_replays.main(["--workers", "1", "--jsonl", *argv])
+    results = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    return code, {r["name"]: r for r in results}
+
+
+def test_truncated_stream_keeps_earlier_records(tmp_path, capsys):
+    path = tmp_path / "day.flrs"
+    with open(path, "wb") as f:
+        for seed in range(5):
+            rp.write_stream(f, record(seed))
+    path.write_bytes(path.read_bytes()[:-10])
+
+    code, results = run(capsys, "--stream", str(path))
+    assert code == 1
+    assert [results[f"{path}#{i}"]["status"] for i in range(5)] == ["ok"] * 4 + ["error"]
+    assert len(results) == 5
+
+
+def test_bad_stream_does_not_stop_other_streams(tmp_path, capsys):
+    good, bad = tmp_path / "good.flrs", tmp_path / "bad.flrs"
+    with open(good, "wb") as f:
+        rp.write_stream(f, record(1))
+    bad.write_bytes(b"\x05\x00")
+
+    code, results = run(capsys, "--stream", str(bad), "--stream", str(tmp_path / "missing.flrs"),
+                        "--stream", str(good))
+    assert code == 1
+    assert results[f"{bad}#0"]["status"] == "error"
+    assert results[str(tmp_path / "missing.flrs")]["status"] == "error"
+    assert results[f"{good}#0"]["status"] == "ok"
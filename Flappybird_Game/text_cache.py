@@ -0,0 +1,123 @@
+"""Кэш отрендеренного текста и атлас глифов для быстро меняющихся чисел.
+
+TextCache — готовые поверхности строк по ключу (шрифт, строка, цвет,
+сглаживание), не больше max_entries штук, давно не использованные
+выбрасываются (LRU). Подходит для надписей, которые меняются редко или
+повторяются: заголовки меню, «Game Over», подписи HUD.
+
+GlyphAtlas — каждый символ набора (по умолчанию цифры) отрендерен один
+раз; строка вроде «Score:125» рисуется по кусочкам: символы из набора —
+готовыми глифами, остальное — целыми кусками через TextCache. Счётчик
+очков или патронов после этого вообще не вызывает font.render. Буквы
+ставятся по ширине глифа, без кернинга между кусками — для цифр разница
+не видна.
+
+Поверхности общие: рисовать поверх них нельзя.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import pygame
+
+Color = Tuple[int, int, int]
+DIGITS = "0123456789"
+
+
+class TextCache:
+    """LRU-кэш font.render по (шрифт, строка, цвет, сглаживание)."""
+
+    def __init__(self, max_entries: int = 512) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, pygame.Surface]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def render(self, font: pygame.font.Font, text: str, color: Color, antialias: bool = True) -> pygame.Surface:
+        key = (font, text, tuple(color), antialias)
+        surface = self._entries.get(key)
+        if surface is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._entries[key] = surface
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> str:
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0.0
+        return (f"кэш текста: {len(self._entries)} строк, попаданий {rate:.1%} ({self.hits}/{total}), "
+                f"вытеснено {self.evictions}")
+
+
+class GlyphAtlas:
+    """Глифы одного шрифта и цвета; draw() рисует строку без font.render."""
+
+    def __init__(
+        self,
+        font: pygame.font.Font,
+        color: Color,
+        chars: str = DIGITS,
+        antialias: bool = True,
+        cache: Optional[TextCache] = None,
+    ) -> None:
+        self.font = font
+        self.color = color
+        self.antialias = antialias
+        self.cache = cache or default_text_cache()
+        self.glyphs: Dict[str, pygame.Surface] = {ch: font.render(ch, antialias, color) for ch in chars}
+        self.height = font.get_height()
+
+    def pieces(self, text: str) -> List[pygame.Surface]:
+        """Поверхности, из которых складывается text, слева направо."""
+        glyphs = self.glyphs
+        out: List[pygame.Surface] = []
+        start = 0
+        for i, ch in enumerate(text):
+            glyph = glyphs.get(ch)
+            if glyph is None:
+                continue
+            if start < i:
+                out.append(self.cache.render(self.font, text[start:i], self.color, self.antialias))
+            out.append(glyph)
+            start = i + 1
+        if start < len(text):
+            out.append(self.cache.render(self.font, text[start:], self.color, self.antialias))
+        return out
+
+    def size(self, text: str) -> Tuple[int, int]:
+        return sum(p.get_width() for p in self.pieces(text)), self.height
+
+    def draw(self, target, text: str, pos: Tuple[int, int]) -> pygame.Rect:
+        """Нарисовать text; target — Surface или рендерер из dirty_render."""
+        x, y = int(pos[0]), int(pos[1])
+        left = x
+        for piece in self.pieces(text):
+            target.blit(piece, (x, y))
+            x += piece.get_width()
+        return pygame.Rect(left, y, x - left, self.height)
+
+
+_default: Optional[TextCache] = None
+
+
+def default_text_cache() -> TextCache:
+    """Общий кэш текста процесса."""
+    global _default
+    if _default is None:
+        _default = TextCache()
+    return _default
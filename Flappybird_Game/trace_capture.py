@@ -0,0 +1,209 @@
+"""Запись трассы кадров по запросу в формате Chrome trace events.
+
+Код игры размечен вложенными отрезками (span): методы — декоратором
+@traced("Game.update"), куски кода — блоком `with tracer.span("pipes"):`.
+Пока запись не идёт, декоратор сразу вызывает функцию, а span() отдаёт
+общий пустой контекст — разметку можно не убирать из боевой сборки.
+
+Запись включается клавишей F4 (повторное нажатие — остановить) или
+переменной окружения при запуске и сама останавливается через max_frames
+кадров. Каждый кадр — отдельный отрезок «frame», остальные вложены в него
+по времени. Результат — trace-<время>.json, который открывается в
+Perfetto (ui.perfetto.dev) или chrome://tracing; по желанию рядом
+пишется .prof с cProfile за то же окно (python -m pstats файл).
+
+Переменные окружения (префикс у каждой игры свой, FLAPPY или PLATFORMER):
+    FLAPPY_TRACE=300        писать первые 300 кадров
+    FLAPPY_TRACE=600:300    пропустить 600 кадров, затем писать 300
+    FLAPPY_TRACE_DIR=папка  куда класть трассы (по умолчанию — текущая)
+    FLAPPY_TRACE_CPROFILE=1 вместе с трассой снимать cProfile
+"""
+
+from __future__ import annotations
+
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+import pygame
+
+TOGGLE_KEY = pygame.K_F4
+# Предохранитель от бесконечного роста: столько отрезков — и запись стоп
+MAX_EVENTS = 500_000
+
+Event = Tuple[str, int, int]  # (имя, начало, конец) в нс perf_counter
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("events", "name", "start")
+
+    def __init__(self, events: List[Event], name: str) -> None:
+        self.events = events
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter_ns()
+
+    def __exit__(self, *exc) -> None:
+        self.events.append((self.name, self.start, time.perf_counter_ns()))
+
+
+class Tracer:
+    """Окно записи отрезков; active — идёт ли запись прямо сейчас."""
+
+    def __init__(self, out_dir: str = ".", max_frames: int = 300, cprofile: bool = False) -> None:
+        self.out_dir = out_dir
+        self.max_frames = max_frames
+        self.cprofile = cprofile
+        self.active = False
+        self.events: List[Event] = []
+        self.frames = 0
+        self.start_after = 0  # номер кадра, с которого начать запись (0 — не ждать)
+        self._frame_no = 0
+        self._frame_start = 0
+        self._profile: Optional[cProfile.Profile] = None
+
+    def configure_from_env(self, prefix: str) -> None:
+        """Прочитать <prefix>_TRACE, <prefix>_TRACE_DIR и <prefix>_TRACE_CPROFILE."""
+        self.out_dir = os.environ.get(f"{prefix}_TRACE_DIR", self.out_dir)
+        self.cprofile = os.environ.get(f"{prefix}_TRACE_CPROFILE") == "1"
+        spec = os.environ.get(f"{prefix}_TRACE")
+        if spec:
+            skip, _, frames = spec.rpartition(":")
+            self.max_frames = int(frames)
+            self.start_after = self._frame_no + int(skip or 0) + 1
+
+    def start(self) -> None:
+        if self.active:
+            return
+        self.events = []
+        self.frames = 0
+        self._frame_start = 0
+        self.active = True
+        if self.cprofile:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def stop(self) -> Optional[str]:
+        """Закончить запись и сохранить трассу; возвращает путь к .json."""
+        if not self.active:
+            return None
+        self.active = False
+        if self._frame_start:
+            self.events.append(("frame", self._frame_start, time.perf_counter_ns()))
+        if self._profile is not None:
+            self._profile.disable()
+        os.makedirs(self.out_dir, exist_ok=True)
+        path = os.path.join(self.out_dir, time.strftime("trace-%Y%m%d-%H%M%S.json"))
+        self.save(path)
+        if self._profile is not None:
+            self._profile.dump_stats(path[:-len(".json")] + ".prof")
+            self._profile = None
+        print(f"трасса: {self.frames} кадров, {len(self.events)} отрезков -> {path}")
+        self.events = []
+        return path
+
+    def toggle(self) -> None:
+        if self.active:
+            self.stop()
+        else:
+            self.start()
+
+    def handle_event(self, event: pygame.event.Event) -> bool:
+        """True, если событие — клавиша старта/остановки записи."""
+        if event.type == pygame.KEYDOWN and event.key == TOGGLE_KEY:
+            self.toggle()
+            return True
+        return False
+
+    def frame(self) -> None:
+        """Начало кадра: закрыть отрезок прошлого кадра, соблюсти границы окна."""
+        self._frame_no += 1
+        if self._frame_no == self.start_after:
+            self.start()
+        if not self.active:
+            return
+        now = time.perf_counter_ns()
+        if self._frame_start:
+            self.events.append(("frame", self._frame_start, now))
+            self.frames += 1
+            if self.frames >= self.max_frames or len(self.events) >= MAX_EVENTS:
+                self._frame_start = 0
+                self.stop()
+                return
+        self._frame_start = now
+
+    def span(self, name: str):
+        """Контекст-отрезок; пока запись не идёт — общий пустой контекст."""
+        if not self.active:
+            return _NULL_SPAN
+        return _Span(self.events, name)
+
+    def trace_events(self) -> dict:
+        """Записанные отрезки в формате Chrome trace events (JSON Object Format)."""
+        pid = os.getpid()
+        tid = threading.main_thread().ident or 0
+        origin = min((start for _, start, _ in self.events), default=0)
+        out = [
+            {"name": "process_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": "game"}},
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": "main"}},
+        ]
+        # Родитель и ребёнок с одинаковым началом: длинный отрезок должен идти первым
+        for name, start, end in sorted(self.events, key=lambda e: (e[1], -e[2])):
+            out.append({
+                "name": name, "cat": "frame" if name == "frame" else "game", "ph": "X",
+                "ts": (start - origin) / 1000, "dur": (end - start) / 1000,
+                "pid": pid, "tid": tid,
+            })
+        return {"traceEvents": out, "displayTimeUnit": "ms"}
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.trace_events(), f, separators=(",", ":"))
+
+
+def traced(name: Optional[str] = None, tracer: Optional[Tracer] = None) -> Callable:
+    """Декоратор: каждый вызов функции — отрезок name (по умолчанию __qualname__)."""
+    def wrap(fn: Callable) -> Callable:
+        label = name or fn.__qualname__
+        t = tracer or default_tracer()
+
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            if not t.active:
+                return fn(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                t.events.append((label, start, time.perf_counter_ns()))
+        return inner
+    return wrap
+
+
+_default: Optional[Tracer] = None
+
+
+def default_tracer() -> Tracer:
+    """Общий трассировщик процесса."""
+    global _default
+    if _default is None:
+        _default = Tracer()
+    return _default
@@ -0,0 +1,139 @@
+"""Общий кэш преобразованных поверхностей (отражение, масштаб, поворот).
+
+Ключ — (исходная поверхность, операция, параметры): одинаковые запросы
+получают один и тот же объект Surface вместо новой копии. Объём кэша
+ограничен (max_bytes по размеру пикселей), при переполнении выбрасываются
+давно не использованные записи (LRU). Счётчики hits/misses/evictions —
+для проверки, что кэш действительно работает.
+
+Результаты общие: рисовать поверх них нельзя. Если поверхность нужно
+дорисовать, передайте make= — функцию, которая построит готовый вариант,
+он тоже кэшируется.
+
+Ключ держит ссылку на исходную поверхность, так что id не переиспользуется,
+пока запись жива. Отражение — инволюция: вместе с flip(a) запоминается и
+обратная запись, поэтому flip(flip(a)) возвращает сам a, а не третью копию.
+Обратная запись хранит чужую поверхность a: в объём кэша она не входит и
+выбрасывается вместе с прямой.
+
+Используется обеими играми (main.py и платформеры в корне репозитория).
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Set, Tuple
+
+import pygame
+
+Key = Tuple[pygame.Surface, str, Hashable]
+
+
+def surface_bytes(surface: pygame.Surface) -> int:
+    return surface.get_pitch() * surface.get_height()
+
+
+class TransformCache:
+    """LRU-кэш преобразований с ограничением по памяти."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Key, pygame.Surface]" = OrderedDict()
+        self._borrowed: Set[Key] = set()    # записи с чужой поверхностью, без учёта в bytes
+        self._inverse: Dict[Key, Key] = {}  # прямая запись flip -> её обратная
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self,
+        source: pygame.Surface,
+        op: str,
+        params: Hashable = (),
+        make: Optional[Callable[[], pygame.Surface]] = None,
+    ) -> pygame.Surface:
+        """Результат op над source; make() вызывается только при промахе."""
+        key = (source, op, params)
+        surface = self._entries.get(key)
+        if surface is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        if make is None:
+            raise KeyError(f"нет построителя для операции {op!r}")
+        surface = make()
+        self._put(key, surface)
+        return surface
+
+    def _size(self, key: Key, surface: pygame.Surface) -> int:
+        return 0 if key in self._borrowed else surface_bytes(surface)
+
+    def _drop(self, key: Key) -> None:
+        surface = self._entries.pop(key, None)
+        if surface is not None:
+            self.bytes -= self._size(key, surface)
+        self._borrowed.discard(key)
+        inverse = self._inverse.pop(key, None)
+        if inverse is not None:
+            self._drop(inverse)
+
+    def _put(self, key: Key, surface: pygame.Surface, owned: bool = True) -> None:
+        self._drop(key)
+        self._entries[key] = surface
+        if not owned:
+            self._borrowed.add(key)
+        self.bytes += self._size(key, surface)
+        # Последнюю добавленную запись не выбрасываем, даже если она больше лимита.
+        # Обратные записи места не занимают и уходят только вместе с прямыми.
+        while self.bytes > self.max_bytes and len(self._entries) - len(self._borrowed) > 1:
+            oldest = next(k for k in self._entries if k not in self._borrowed)
+            self._drop(oldest)
+            self.evictions += 1
+
+    def flip(self, source: pygame.Surface, flip_x: bool, flip_y: bool) -> pygame.Surface:
+        params = (bool(flip_x), bool(flip_y))
+        key = (source, "flip", params)
+        if key in self._entries:
+            return self.get(source, "flip", params)
+        flipped = self.get(source, "flip", params, lambda: pygame.transform.flip(source, *params))
+        inverse = (flipped, "flip", params)
+        self._put(inverse, source, owned=False)
+        self._inverse[key] = inverse
+        return flipped
+
+    def scale(self, source: pygame.Surface, size: Tuple[int, int], smooth: bool = False) -> pygame.Surface:
+        size = (int(size[0]), int(size[1]))
+        if smooth:
+            return self.get(source, "smoothscale", size, lambda: pygame.transform.smoothscale(source, size))
+        return self.get(source, "scale", size, lambda: pygame.transform.scale(source, size))
+
+    def rotate(self, source: pygame.Surface, angle: float) -> pygame.Surface:
+        return self.get(source, "rotate", angle, lambda: pygame.transform.rotate(source, angle))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._borrowed.clear()
+        self._inverse.clear()
+        self.bytes = 0
+
+    def stats(self) -> str:
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0.0
+        return (f"кэш преобразований: {len(self._entries)} записей, {self.bytes / 1024:.0f} КБ, "
+                f"попаданий {rate:.1%} ({self.hits}/{total}), вытеснено {self.evictions}")
+
+
+_default: Optional[TransformCache] = None
+
+
+def default_cache() -> TransformCache:
+    """Общий кэш процесса."""
+    global _default
+    if _default is None:
+        _default = TransformCache()
+    return _default
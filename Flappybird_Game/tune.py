@@ -0,0 +1,189 @@
+"""Подбор сложности: перебор pipe_gap, pipe_speed, gravity и pipe_frequency.
+
+Каждый набор параметров играется много раз безоконно (sim.FlappySim) с
+фиксированными seed'ами в пуле процессов; результат — таблица наборов,
+упорядоченная по близости к целевому счёту (или по среднему счёту).
+
+    python tune.py --gap 100,125,150 --speed 8,10 --games 300 --target 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import itertools
+import json
+import multiprocessing
+import random
+import statistics
+import sys
+from typing import Callable, Dict, List, Optional
+
+from sim import FlappyConfig, FlappySim
+
+# Моменты (в секундах игры), для которых в таблицу выводится доля выживших
+SURVIVAL_MARKS = (5, 10, 30, 60)
+
+
+def random_policy(sim: FlappySim, rng: random.Random) -> bool:
+    """Нажимать наугад примерно раз в полсекунды."""
+    return rng.random() < 2 / sim.config.fps
+
+
+def scripted_policy(sim: FlappySim, rng: random.Random) -> bool:
+    """Прыгать по нижнему краю ближайшего зазора так, чтобы дуга прыжка была по его середине.
+
+    Прыжок поднимает птицу на flap_speed² / (2·gravity) пикселей; отступ
+    от нижнего края выбран так, чтобы вершина дуги и низ разошлись от краёв
+    зазора поровну. Политика не знает трассы наперёд, поэтому на резких
+    перепадах зазора разбивается — счёт заметно зависит от параметров.
+    """
+    cfg = sim.config
+    gap_y = (cfg.height - cfg.pipe_gap) // 2
+    for pipe_x, pipe_y, _ in sim.iter_pipes():
+        if pipe_x + sim.pipe_width > cfg.bird_x:
+            gap_y = pipe_y
+            break
+    bird_h = sim.bird_size[1]
+    rise = cfg.flap_speed ** 2 / (2 * cfg.gravity) if cfg.gravity > 0 else 0.0
+    margin = max(2.0, (cfg.pipe_gap - bird_h - rise) / 2)
+    # Где будет низ птицы после следующего тика без прыжка
+    bottom = sim.bird_y + sim.bird_speed + cfg.gravity + bird_h
+    return bottom > gap_y + cfg.pipe_gap - margin
+
+
+POLICIES: Dict[str, Callable[[FlappySim, random.Random], bool]] = {
+    "random": random_policy,
+    "scripted": scripted_policy,
+}
+
+
+def evaluate(job: dict) -> dict:
+    """Сыграть job["games"] игр с одним набором параметров (выполняется в воркере)."""
+    config = FlappyConfig(**job["params"])
+    policy = POLICIES[job["policy"]]
+    max_ticks = job["max_ticks"]
+    sim = FlappySim(config)
+    scores: List[int] = []
+    lifetimes: List[int] = []
+    for seed in range(job["seed"], job["seed"] + job["games"]):
+        sim.reset(seed)
+        rng = random.Random(~seed)
+        while sim.tick < max_ticks and sim.step(policy(sim, rng)):
+            pass
+        scores.append(sim.score)
+        lifetimes.append(sim.tick)
+
+    # Кривая выживания: доля игр, продолжавшихся дольше каждой секунды
+    seconds = max_ticks // config.fps
+    survival = [
+        sum(1 for t in lifetimes if t > s * config.fps) / len(lifetimes) for s in range(seconds + 1)
+    ]
+    ordered = sorted(scores)
+    return {
+        "params": job["params"],
+        "mean": statistics.fmean(scores),
+        "median": statistics.median(scores),
+        "p90": ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))],
+        "max": ordered[-1],
+        "histogram": {str(k): ordered.count(k) for k in sorted(set(ordered))},
+        "survival": survival,
+    }
+
+
+def _floats(text: str) -> List[float]:
+    return [float(v) for v in text.split(",")]
+
+
+def _ints(text: str) -> List[int]:
+    return [int(v) for v in text.split(",")]
+
+
+def build_jobs(args: argparse.Namespace) -> List[dict]:
+    jobs = []
+    for gap, speed, gravity, frequency in itertools.product(
+        args.gap, args.speed, args.gravity, args.frequency
+    ):
+        params = {
+            "pipe_gap": gap,
+            "pipe_speed": speed,
+            "gravity": gravity,
+            "pipe_frequency": frequency,
+            "gap_margin": args.margin,
+        }
+        # Зазор должен помещаться на экране с отступами
+        if FlappyConfig().height - 2 * args.margin - gap < 0:
+            continue
+        jobs.append(
+            {
+                "params": params,
+                "policy": args.policy,
+                "games": args.games,
+                "seed": args.seed,
+                "max_ticks": args.max_ticks,
+            }
+        )
+    return jobs
+
+
+def rank(results: List[dict], target: Optional[float]) -> List[dict]:
+    if target is None:
+        return sorted(results, key=lambda r: (-r["mean"], -r["median"]))
+    return sorted(results, key=lambda r: (abs(r["median"] - target), abs(r["mean"] - target)))
+
+
+def write_table(results: List[dict], path: str) -> None:
+    fields = ["rank", "pipe_gap", "pipe_speed", "gravity", "pipe_frequency", "gap_margin",
+              "mean", "median", "p90", "max"] + [f"alive_{s}s" for s in SURVIVAL_MARKS]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(fields)
+        for i, r in enumerate(results, 1):
+            p = r["params"]
+            survival = r["survival"]
+            writer.writerow(
+                [i, p["pipe_gap"], p["pipe_speed"], p["gravity"], p["pipe_frequency"], p["gap_margin"],
+                 f"{r['mean']:.2f}", r["median"], r["p90"], r["max"]]
+                + [f"{survival[s]:.3f}" if s < len(survival) else "" for s in SURVIVAL_MARKS]
+            )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    defaults = FlappyConfig()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--gap", type=_ints, default=[defaults.pipe_gap], help="pipe_gap, через запятую")
+    parser.add_argument("--speed", type=_ints, default=[defaults.pipe_speed], help="pipe_speed")
+    parser.add_argument("--gravity", type=_floats, default=[defaults.gravity], help="gravity")
+    parser.add_argument("--frequency", type=_ints, default=[defaults.pipe_frequency], help="pipe_frequency, мс")
+    parser.add_argument("--margin", type=int, default=defaults.gap_margin, help="отступ зазора от краёв")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="scripted")
+    parser.add_argument("--games", type=int, default=200, help="игр на набор параметров")
+    parser.add_argument("--seed", type=int, default=0, help="первый seed")
+    parser.add_argument("--max-ticks", type=int, default=60 * defaults.fps, help="предел длины игры, кадры")
+    parser.add_argument("--target", type=float, default=None, help="желаемый медианный счёт")
+    parser.add_argument("--workers", type=int, default=None, help="число процессов (по умолчанию — все ядра)")
+    parser.add_argument("--out", default="tuning.csv", help="таблица результатов")
+    parser.add_argument("--curves", default=None, help="JSON с гистограммами и кривыми выживания")
+    args = parser.parse_args(argv)
+
+    jobs = build_jobs(args)
+    if not jobs:
+        parser.error("нет допустимых наборов параметров")
+    results = []
+    with multiprocessing.Pool(args.workers) as pool:
+        for done, result in enumerate(pool.imap_unordered(evaluate, jobs), 1):
+            results.append(result)
+            print(f"[{done}/{len(jobs)}] {result['params']} mean={result['mean']:.2f}", file=sys.stderr)
+
+    results = rank(results, args.target)
+    write_table(results, args.out)
+    if args.curves:
+        with open(args.curves, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=1)
+    for i, r in enumerate(results[:10], 1):
+        print(f"{i:2}. {r['params']}  mean={r['mean']:.2f} median={r['median']} p90={r['p90']} max={r['max']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
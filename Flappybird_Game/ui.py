@@ -0,0 +1,135 @@
+"""Простые виджеты меню: Label, CounterLabel, Button, ScoreList.
+
+Каждый виджет рендерит текст один раз и хранит готовую поверхность;
+повторный рендер — только при смене текста или состояния, и то через общий
+кэш text_cache. Счётчики (CounterLabel) собираются из глифов атласа и
+шрифт не трогают вовсе. Рисуются через рендерер из dirty_render
+(blit/fill_rect), кнопки сами проверяют клики.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import pygame
+
+from text_cache import GlyphAtlas, default_text_cache
+
+Color = Tuple[int, int, int]
+
+
+class Label:
+    """Строка текста; center_x — выравнивание по центру, иначе pos — левый верхний угол."""
+
+    def __init__(
+        self,
+        font: pygame.font.Font,
+        text: str,
+        color: Color,
+        pos: Tuple[int, int] = (0, 0),
+        center_x: Optional[int] = None,
+    ) -> None:
+        self.font = font
+        self.color = color
+        self.pos = pos
+        self.center_x = center_x
+        self._text: Optional[str] = None
+        self.surface: pygame.Surface
+        self.rect: pygame.Rect
+        self.text = text
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    @text.setter
+    def text(self, value: str) -> None:
+        if value == self._text:
+            return
+        self._text = value
+        self.surface = default_text_cache().render(self.font, value, self.color)
+        self.rect = self.surface.get_rect(topleft=self.pos)
+        if self.center_x is not None:
+            self.rect.centerx = self.center_x
+
+    def draw(self, renderer) -> None:
+        renderer.blit(self.surface, self.rect.topleft, key=(id(self), self._text))
+
+
+class CounterLabel:
+    """«Префикс + число», например Score:12; value можно менять хоть каждый кадр."""
+
+    def __init__(self, atlas: GlyphAtlas, prefix: str, pos: Tuple[int, int], value: int = 0) -> None:
+        self.atlas = atlas
+        self.prefix = prefix
+        self.pos = pos
+        self.value = value
+
+    def draw(self, renderer) -> pygame.Rect:
+        return self.atlas.draw(renderer, f"{self.prefix}{self.value}", self.pos)
+
+
+class Button:
+    """Прямоугольная кнопка с подписью; handle_event() ловит клик мышью."""
+
+    def __init__(
+        self,
+        font: pygame.font.Font,
+        text: str,
+        rect: pygame.Rect,
+        on_click: Optional[Callable[[], None]] = None,
+        bg: Color = (200, 200, 210),
+        fg: Color = (0, 0, 0),
+    ) -> None:
+        self.rect = pygame.Rect(rect)
+        self.bg = bg
+        self.on_click = on_click
+        self.label = Label(font, text, fg, (self.rect.x + 10, self.rect.y + 10))
+
+    @property
+    def text(self) -> str:
+        return self.label.text
+
+    @text.setter
+    def text(self, value: str) -> None:
+        self.label.text = value
+
+    def handle_event(self, event: pygame.event.Event) -> bool:
+        """True, если событие — клик по кнопке (on_click уже вызван)."""
+        if event.type == pygame.MOUSEBUTTONDOWN and self.rect.collidepoint(event.pos):
+            if self.on_click is not None:
+                self.on_click()
+            return True
+        return False
+
+    def draw(self, renderer) -> None:
+        renderer.fill_rect(self.bg, self.rect, key=(id(self), self.bg))
+        self.label.draw(renderer)
+
+
+class ScoreList:
+    """Нумерованный список «имя - очки»; перерисовывается, только если рекорды поменялись."""
+
+    def __init__(self, font: pygame.font.Font, color: Color, center_x: int, top: int, spacing: int = 40) -> None:
+        self.font = font
+        self.color = color
+        self.center_x = center_x
+        self.top = top
+        self.spacing = spacing
+        self._records: Optional[Tuple[Tuple[str, int], ...]] = None
+        self.lines: List[Label] = []
+
+    def set_records(self, records: Sequence[Tuple[str, int]]) -> None:
+        records = tuple(records)
+        if records == self._records:
+            return
+        self._records = records
+        self.lines = [
+            Label(self.font, f"{i + 1}. {name} - {score}", self.color,
+                  (0, self.top + i * self.spacing), center_x=self.center_x)
+            for i, (name, score) in enumerate(records)
+        ]
+
+    def draw(self, renderer) -> None:
+        for line in self.lines:
+            line.draw(renderer)
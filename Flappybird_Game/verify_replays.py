@@ -0,0 +1,137 @@
+"""Проверка заявленных результатов: каждый реплей переигрывается без отрисовки.
+
+Реплеи берутся из файлов, папок (рекурсивно, *.flr) и потоков с префиксом
+длины (replay.write_stream; "-" — stdin). Работа распределяется по всем
+ядрам, результаты печатаются по мере готовности.
+
+Реплей засчитывается (ok), только если записан с параметрами из
+ALLOWED_CONFIGS — иначе rejected: в файле можно записать любую физику,
+например без гравитации. Реплеи версии 1 (прямоугольные столкновения)
+переигрываются по своим правилам, но отмечаются отдельно — legacy.
+Обрезанный или испорченный поток — ошибка для записи, на которой он
+оборвался; записи до неё проверяются как обычно. Код выхода 1, если хоть
+один реплей не засчитан.
+
+    python verify_replays.py replays/ --bad-only
+    cat day.flrs | python verify_replays.py --stream - --jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from dataclasses import replace
+from typing import Iterator, List, Optional, Tuple
+
+from replay import ReplayError, decode, iter_stream, simulate
+from sim import FlappyConfig
+
+# Параметры, с которыми играют автоматы; рекорды с любыми другими не принимаются
+ALLOWED_CONFIGS = (FlappyConfig(),)
+STATUSES = ("ok", "legacy", "mismatch", "rejected", "error")
+
+# (имя, путь к файлу или None, данные или None, ошибка чтения потока или None)
+Job = Tuple[str, Optional[str], Optional[bytes], Optional[str]]
+
+
+def verify(job: Job) -> dict:
+    """Переиграть один реплей (выполняется в воркере)."""
+    name, path, data, error = job
+    if error is not None:
+        return {"name": name, "status": "error", "error": error}
+    try:
+        if data is None:
+            with open(path, "rb") as f:
+                data = f.read()
+        replay = decode(data)
+    except (OSError, ReplayError) as exc:
+        return {"name": name, "status": "error", "error": str(exc)}
+    # Версия 1 принудительно без масок — сравниваем остальные параметры
+    config = replace(replay.config, pixel_collision=True) if replay.version == 1 else replay.config
+    if config not in ALLOWED_CONFIGS:
+        return {"name": name, "status": "rejected", "error": f"параметры игры не из списка разрешённых: {config}"}
+    try:
+        sim = simulate(replay)
+    except Exception as exc:  # битый реплей не должен ронять всю пачку
+        return {"name": name, "status": "error", "error": f"{type(exc).__name__}: {exc}"}
+    # Игра должна закончиться ровно там, где закончилась запись
+    ok = sim.score == replay.score and sim.tick == replay.ticks
+    return {
+        "name": name,
+        "status": ("ok" if replay.version != 1 else "legacy") if ok else "mismatch",
+        "seed": replay.seed,
+        "claimed": replay.score,
+        "score": sim.score,
+        "ticks": sim.tick,
+        "claimed_ticks": replay.ticks,
+    }
+
+
+def iter_jobs(paths: List[str], streams: List[str]) -> Iterator[Job]:
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for fn in sorted(files):
+                    if fn.endswith(".flr"):
+                        full = os.path.join(root, fn)
+                        yield full, full, None, None
+        else:
+            yield path, path, None, None
+    for stream in streams:
+        # Испорченный поток — ошибка для его записи, а не для всего прогона
+        try:
+            f = sys.stdin.buffer if stream == "-" else open(stream, "rb")
+        except OSError as exc:
+            yield stream, None, None, str(exc)
+            continue
+        i = 0
+        try:
+            for data in iter_stream(f):
+                yield f"{stream}#{i}", None, data, None
+                i += 1
+        except ReplayError as exc:
+            yield f"{stream}#{i}", None, None, str(exc)
+        finally:
+            if f is not sys.stdin.buffer:
+                f.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", help="файлы .flr или папки с ними")
+    parser.add_argument("--stream", action="append", default=[], help="поток реплеев ('-' — stdin)")
+    parser.add_argument("--workers", type=int, default=None, help="число процессов (по умолчанию — все ядра)")
+    parser.add_argument("--bad-only", action="store_true", help="печатать только несовпадения и ошибки")
+    parser.add_argument("--jsonl", action="store_true", help="результаты в JSON Lines")
+    args = parser.parse_args(argv)
+    if not args.paths and not args.stream:
+        parser.error("укажите файлы, папки или --stream")
+
+    counts = dict.fromkeys(STATUSES, 0)
+    start = time.perf_counter()
+    with multiprocessing.Pool(args.workers) as pool:
+        for result in pool.imap_unordered(verify, iter_jobs(args.paths, args.stream), chunksize=64):
+            counts[result["status"]] += 1
+            if args.bad_only and result["status"] == "ok":
+                continue
+            if args.jsonl:
+                print(json.dumps(result, ensure_ascii=False), flush=True)
+            elif "error" in result:
+                print(f"{result['status'].upper():8} {result['name']}: {result['error']}", flush=True)
+            else:
+                print(f"{result['status'].upper():8} {result['name']}: claimed={result['claimed']} "
+                      f"score={result['score']} ticks={result['ticks']}/{result['claimed_ticks']}", flush=True)
+
+    total = sum(counts.values())
+    elapsed = time.perf_counter() - start
+    print(f"проверено {total} за {elapsed:.1f} с: " + " ".join(f"{k}={v}" for k, v in counts.items()),
+          file=sys.stderr)
+    return 0 if counts["ok"] == total else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
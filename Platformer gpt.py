@@ -7,12 +7,20 @@ from __future__ import annotations
 
 # 1) Импорты стандартной библиотеки и pygame
 import math
+import os
 import sys
 from dataclasses import dataclass
 from typing import List, Tuple, Optional, Iterable
 
 import pygame as pg
 
+# Общие с Flappy bird модули (кэши, профилировщик) лежат в Flappybird_Game/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Flappybird_Game"))
+from phase_profiler import PhaseProfiler  # noqa: E402
+from text_cache import DIGITS, GlyphAtlas, default_text_cache  # noqa: E402
+from trace_capture import default_tracer, traced  # noqa: E402
+from transform_cache import default_cache  # noqa: E402
+
 
 # 2) Класс Settings с константами:
 #    - размеры окна, тайла, мира
@@ -152,6 +160,11 @@ class ResourceManager:
         self.font_small = pg.font.SysFont(None, 18)
         self.font = pg.font.SysFont(None, 24)
         self.font_big = pg.font.SysFont(None, 48)
+        # Отражённые/масштабированные поверхности — общие, рисовать поверх нельзя
+        self.transforms = default_cache()
+        # Надписи HUD — из кэша, счётчик патронов — из глифов
+        self.text = default_text_cache()
+        self.ammo_glyphs = GlyphAtlas(self.font, Settings.YELLOW, DIGITS + "/")
 
         # Кэш примитивных тайлов
         self.tile_platform = self._make_tile(Settings.PLATFORM_COLOR)
@@ -189,23 +202,23 @@ class ResourceManager:
             (x + 2, y + 2, int((Settings.HUD_BAR_W - 4) * health_ratio), Settings.HUD_BAR_H - 4),
             border_radius=4,
         )
-        txt = self.font.render("HP", True, Settings.WHITE)
+        txt = self.text.render(self.font, "HP", Settings.WHITE)
         screen.blit(txt, (x + Settings.HUD_BAR_W + 8, y - 2))
 
         # Уровень
-        lvl_txt = self.font.render(f"Уровень: {level_index + 1}", True, Settings.WHITE)
+        lvl_txt = self.text.render(self.font, f"Уровень: {level_index + 1}", Settings.WHITE)
         screen.blit(lvl_txt, (x, y + Settings.HUD_BAR_H + 6))
 
         # Боезапас
         ammo_text = f"{ammo_in_mag}/{reserve_ammo}"
         if reloading:
             ammo_text += " (перезарядка)"
-        ammo_surf = self.font.render(ammo_text, True, Settings.YELLOW)
-        screen.blit(ammo_surf, (Settings.WIDTH - ammo_surf.get_width() - 12, y))
+        ammo_w, _ = self.ammo_glyphs.size(ammo_text)
+        self.ammo_glyphs.draw(screen, ammo_text, (Settings.WIDTH - ammo_w - 12, y))
 
     def center_text(self, screen: pg.Surface, text: str, color: Tuple[int, int, int]) -> None:
         """Отрисовать крупный текст по центру."""
-        surf = self.font_big.render(text, True, color)
+        surf = self.text.render(self.font_big, text, color)
         rect = surf.get_rect(center=(Settings.WIDTH // 2, Settings.HEIGHT // 3))
         screen.blit(surf, rect)
 
@@ -255,7 +268,7 @@ class Platform(pg.sprite.Sprite):
 
     def __init__(self, x: int, y: int, w: int, h: int, rm: ResourceManager) -> None:
         super().__init__()
-        self.image = pg.transform.scale(rm.tile_platform, (w, h))
+        self.image = rm.transforms.scale(rm.tile_platform, (w, h))
         self.rect = pg.Rect(x, y, w, h)
 
 
@@ -264,15 +277,20 @@ class Hazard(pg.sprite.Sprite):
 
     def __init__(self, x: int, y: int, w: int, h: int, rm: ResourceManager) -> None:
         super().__init__()
-        self.image = pg.transform.scale(rm.tile_hazard, (w, h))
+        self.image = rm.transforms.get(rm.tile_hazard, "hazard", (w, h), lambda: self._make_image(rm, w, h))
+        self.rect = pg.Rect(x, y, w, h)
+
+    @staticmethod
+    def _make_image(rm: ResourceManager, w: int, h: int) -> pg.Surface:
+        image = pg.transform.scale(rm.tile_hazard, (w, h))
         # добавить визуальные "зубцы"
         for i in range(0, w, 12):
             pg.draw.polygon(
-                self.image,
+                image,
                 Settings.RED,
                 [(i, h), (i + 6, max(0, h - 16)), (i + 12, h)],
             )
-        self.rect = pg.Rect(x, y, w, h)
+        return image
 
 
 # 7) Player: управление A/D, SPACE; атаки J (ближняя), K (дальняя), R (перезарядка)
@@ -675,19 +693,31 @@ class Game:
         self.state: str = Game.RUNNING
         self.level_complete_timer: float = 0.0
 
+        # F3 (или PLATFORMER_PROFILER=1) — оверлей со временем фаз кадра
+        self.profiler = PhaseProfiler(enabled=os.environ.get("PLATFORMER_PROFILER") == "1")
+        # F4 (или PLATFORMER_TRACE=кадры) — трасса кадров для Perfetto
+        self.tracer = default_tracer()
+        self.tracer.configure_from_env("PLATFORMER")
+
     # ------------------ Основной цикл ------------------
     def run(self) -> None:
         """Запуск игрового цикла."""
         running = True
         while running:
+            self.profiler.begin_frame()
+            self.tracer.frame()
             dt = self.clock.tick(Settings.FPS) / 1000.0
+            self.profiler.mark("tick")
             # Ограничим dt на случай зависания
             dt = min(dt, 0.05)
 
             running = self.handle_events()
+            self.profiler.mark("events")
             self.update(dt)
+            self.profiler.mark("update")
             self.draw()
 
+        self.tracer.stop()
         pg.quit()
         sys.exit(0)
 
@@ -697,6 +727,8 @@ class Game:
         for event in pg.event.get():
             if event.type == pg.QUIT:
                 return False
+            if self.profiler.handle_event(event) or self.tracer.handle_event(event):
+                continue
             if event.type == pg.KEYDOWN:
                 if event.key == pg.K_ESCAPE:
                     # По требованию: ESC — выход
@@ -704,6 +736,7 @@ class Game:
         return True
 
     # ------------------ Обновление состояния ------------------
+    @traced("Game.update")
     def update(self, dt: float) -> None:
         """Логика игры и столкновений."""
         if self.state == Game.LEVEL_COMPLETE:
@@ -779,6 +812,7 @@ class Game:
         self.camera.update(self.player.rect)
 
     # ------------------ Столкновения ------------------
+    @traced("Game.move_and_collide_x")
     def move_and_collide_x(self, ent: Entity, platforms: pg.sprite.Group) -> None:
         """Перемещение по X и разрешение коллизий со сплошными тайлами."""
         ent.rect.x += int(ent.vel.x * Settings.FIXED_DT)
@@ -790,6 +824,7 @@ class Game:
                 ent.rect.left = p.rect.right
             ent.vel.x = 0.0
 
+    @traced("Game.move_and_collide_y")
     def move_and_collide_y(self, ent: Entity, platforms: pg.sprite.Group) -> None:
         """Перемещение по Y и разрешение коллизий со сплошными тайлами."""
         was_on_ground = isinstance(ent, Player) and ent.on_ground
@@ -842,6 +877,7 @@ class Game:
         e.last_hit_by_player = False
 
     # ------------------ Взаимодействия ------------------
+    @traced("Game.handle_hazards")
     def handle_hazards(self) -> None:
         """Урон от шипов/лавы игроку и врагам; снаряды исчезают."""
         # Игрок
@@ -925,6 +961,7 @@ class Game:
         self.state = Game.RUNNING
 
     # ------------------ Отрисовка ------------------
+    @traced("Game.draw")
     def draw(self) -> None:
         """Отрисовать мир, сущности, HUD и состояние."""
         self.screen.fill(Settings.BG_COLOR)
@@ -973,7 +1010,11 @@ class Game:
             2,
         )
 
-        pg.display.flip()
+        self.profiler.draw(self.screen, pos=(Settings.HUD_MARGIN, 60))
+        self.profiler.mark("draw")
+        with self.tracer.span("display.flip"):
+            pg.display.flip()
+        self.profiler.mark("flip")
 
 
 # 13) Две примерные карты уровней в коде (списки строк), где:
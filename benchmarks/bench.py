@@ -0,0 +1,418 @@
+"""Бенчмарки обеих игр без окна (SDL dummy) со сравнением с эталоном.
+
+Сценарии — фиксированные и детерминированные (свой seed):
+
+    flappy_empty   — Flappy без труб, только птица и счёт
+    flappy_normal  — обычная игра (параметры main.py)
+    flappy_dense   — труба каждые 9 тиков, на экране их ~15
+    flappy_party   — 8 птиц на общих трубах (party.py)
+    plat_empty     — платформер: пустая комната
+    plat_crowd     — 90 врагов и ~300 пуль одновременно
+    plat_huge      — уровень 400x40 тайлов (тысячи платформ)
+
+Flappy гоняется целиком — настоящий main.main() через headless.py (демо-
+режим с автопилотом, для партии — сценарий нажатий), меряется кадр целиком
+(frame_ms). У платформера отдельно замеряются Game.update и Game.draw.
+Всё — mean/p95/p99 в миллисекундах процессорного времени потока
+(thread_time_ns), медиана из --repeat прогонов. Процессорное время не
+включает вытеснение другими процессами, на общей машине оно в разы
+стабильнее настенного; настенное время кадра (perf_counter_ns) пишется
+рядом как wall_ms, но с эталоном не сравнивается. Затем отдельным, более
+коротким прогоном под tracemalloc — выделения памяти Python за кадр:
+alloc_kb — сколько временно выделено за кадр (пик минус начало), blocks —
+на сколько блоков выросла куча (утечки/накопление). Память SDL (пиксели
+поверхностей) tracemalloc не видит. Под tracemalloc время не меряется — он
+сильно замедляет кадр.
+
+Результаты пишутся в JSON (--out) и сравниваются с эталоном
+benchmarks/baseline.json: метрика считается регрессией, если выросла
+больше допуска из COMPARED (или единого --tolerance) и больше
+абсолютного порога оттуда же. Допуски подобраны по разбросу между
+запусками неизменного дерева, так что гейт ловит заметные (в полтора-два
+раза) замедления, а не шум. Код возврата 1 при регрессиях — годится как
+проверка перед выкладкой на автоматы. Эталон снимается на той же машине:
+--save-baseline.
+
+    python benchmarks/bench.py
+    python benchmarks/bench.py --only plat_huge --frames 120
+    python benchmarks/bench.py --save-baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import gc
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FLAPPY_DIR = os.path.join(ROOT, "Flappybird_Game")
+PLATFORMER_FILE = os.path.join(ROOT, "Platformer gpt.py")
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+sys.path.insert(0, FLAPPY_DIR)
+
+import pygame  # noqa: E402
+
+from frame_stats import _percentile  # noqa: E402
+
+Step = Callable[[], None]
+# Метрики, которые сравниваются с эталоном: (допустимый рост — доля, абсолютный порог).
+# Допуски взяты с запасом от разброса между запусками на неизменном дереве: на
+# общей машине медиана среднего гуляет до ~40%, хвосты (p95/p99) — до ~55%.
+# Выделения памяти детерминированы, для них допуск узкий.
+COMPARED: Dict[str, Tuple[float, float]] = {
+    "frame_ms.mean": (0.6, 0.1), "frame_ms.p95": (0.8, 0.5), "frame_ms.p99": (1.0, 2.0),
+    "update_ms.mean": (0.6, 0.1), "update_ms.p95": (0.8, 0.5), "update_ms.p99": (1.0, 2.0),
+    "draw_ms.mean": (0.6, 0.1), "draw_ms.p95": (0.8, 0.5), "draw_ms.p99": (1.0, 2.0),
+    "alloc_kb": (0.25, 1.0),
+}
+
+
+# ------------------ Flappy bird ------------------
+# Flappy меряется целиком: настоящий main.main() через headless.py, так что
+# любая правка игрового цикла попадает в замер. Одиночные сценарии играет
+# демо-режим (автопилот, перезапуск после аварии), партию — сценарий ввода.
+FLAPPY_SCENARIOS: Dict[str, Tuple[Dict[str, object], int]] = {
+    "flappy_empty": ({"pipe_frequency": 10 ** 9}, 1),
+    "flappy_normal": ({}, 1),
+    "flappy_dense": ({"pipe_frequency": 150}, 1),
+    "flappy_party": ({}, 8),
+}
+
+
+def party_script(frames: int, players: int) -> Dict[int, List[pygame.event.Event]]:
+    """Start, прыжки игроков каждый в своём ритме; после проигрыша — Enter и снова Start."""
+    from party import PLAYER_KEYS
+
+    script: Dict[int, List[pygame.event.Event]] = {}
+    for f in range(2, frames):
+        events = script.setdefault(f, [])
+        if f % 90 == 0:
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN))
+        elif f % 90 in (1, 2):
+            events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(600, 240), button=1))
+        for i in range(players):
+            if (f + 3 * i) % (16 + i) == 0:
+                events.append(pygame.event.Event(pygame.KEYDOWN, key=PLAYER_KEYS[i]))
+    return script
+
+
+@contextlib.contextmanager
+def _game_env(players: int):
+    """Временная папка с картинками (игра пишет records.txt в текущую) и переменные окружения."""
+    from assets import LAZY
+
+    env = {"FLAPPY_PLAYERS": str(players), "FLAPPY_ATTRACT": "0.1" if players == 1 else "0"}
+    saved = {key: os.environ.get(key) for key in env}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in LAZY:
+            shutil.copy(os.path.join(FLAPPY_DIR, name), tmp)
+        os.environ.update(env)
+        os.chdir(tmp)
+        try:
+            yield
+        finally:
+            os.chdir(cwd)
+            for key, value in saved.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+
+def measure_game(name: str, frames: int, warmup: int, alloc_frames: int, repeat: int = 5) -> Dict[str, object]:
+    """Замер Flappy-сценария: кадр целиком (frame_ms) между вызовами on_frame."""
+    import headless
+    from sim import FlappyConfig
+
+    config_kwargs, players = FLAPPY_SCENARIOS[name]
+    timed_end = warmup + frames * repeat
+    total = timed_end + alloc_frames + 1
+    cpu_marks: List[int] = []
+    wall_marks: List[int] = []
+    alloc: List[int] = []
+    blocks: List[int] = []
+    traced = {"bytes": 0, "blocks": 0}
+
+    def on_frame(frame: int) -> None:
+        if warmup <= frame <= timed_end:
+            wall_marks.append(time.perf_counter_ns())
+            cpu_marks.append(time.thread_time_ns())
+        if frame == timed_end:
+            gc.collect()
+            tracemalloc.start()
+        elif frame > timed_end:
+            alloc.append(tracemalloc.get_traced_memory()[1] - traced["bytes"])
+            blocks.append(sys.getallocatedblocks() - traced["blocks"])
+        if frame >= timed_end:
+            tracemalloc.reset_peak()
+            traced["bytes"] = tracemalloc.get_traced_memory()[0]
+            traced["blocks"] = sys.getallocatedblocks()
+
+    script = party_script(total, players) if players > 1 else {}
+    random.seed(1)
+    with _game_env(players), contextlib.redirect_stdout(io.StringIO()):
+        try:
+            headless.run(total, script, 1000 / 60, FlappyConfig(**config_kwargs), on_frame)
+        finally:
+            tracemalloc.stop()
+
+    cpu_ns = [b - a for a, b in zip(cpu_marks, cpu_marks[1:])]
+    wall_ns = [b - a for a, b in zip(wall_marks, wall_marks[1:])]
+    return {
+        "frames": len(cpu_ns),
+        "frame_ms": _median([_describe(cpu_ns[i:i + frames]) for i in range(0, len(cpu_ns), frames)]),
+        "wall_ms": _median([_describe(wall_ns[i:i + frames]) for i in range(0, len(wall_ns), frames)]),
+        "alloc_kb": sum(alloc) / max(1, len(alloc)) / 1024,
+        "blocks": sum(blocks) / max(1, len(blocks)),
+    }
+
+
+# ------------------ Платформер ------------------
+_platformer = None
+
+
+def platformer_module():
+    """Platformer gpt.py как модуль (имя файла с пробелом не импортировать обычным import)."""
+    global _platformer
+    if _platformer is None:
+        spec = importlib.util.spec_from_file_location("platformer", PLATFORMER_FILE)
+        _platformer = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(_platformer)
+    return _platformer
+
+
+def room(width: int, height: int) -> List[str]:
+    """Пустая комната в стенах с игроком у левого края."""
+    rows = ["X" * width] + ["X" + " " * (width - 2) + "X" for _ in range(height - 2)] + ["X" * width]
+    rows[height - 2] = "XP" + rows[height - 2][2:]
+    return rows
+
+
+def crowd_level(enemies: int = 90) -> List[str]:
+    rows = [list(r) for r in room(60, 14)]
+    for shelf in (4, 8):
+        for x in range(6, 54):
+            if x % 12 < 9:
+                rows[shelf][x] = "X"
+    spots = [(y, x) for y in (3, 7, 12) for x in range(4, 58)]
+    for y, x in random.Random(2).sample(spots, enemies):
+        rows[y][x] = "E"
+    return ["".join(r) for r in rows]
+
+
+def huge_level(width: int = 400, height: int = 40, enemies: int = 20) -> List[str]:
+    rng = random.Random(3)
+    rows = [list(r) for r in room(width, height)]
+    for y in range(4, height - 2, 4):
+        x = 2
+        while x < width - 12:
+            length = rng.randint(3, 10)
+            for i in range(length):
+                rows[y][x + i] = "^" if rng.random() < 0.05 else "X"
+            x += length + rng.randint(2, 8)
+    for _ in range(enemies):
+        y = rng.randrange(4, height - 2, 4) - 1
+        rows[y][rng.randrange(2, width - 2)] = "E"
+    rows[1][width - 3] = "G"
+    return ["".join(r) for r in rows]
+
+
+def _platformer_game(scheme: List[str], bullets: int = 0) -> Tuple[Step, Step]:
+    m = platformer_module()
+    game = m.Game()
+    game.level_schemes = [[row.replace(".", " ") for row in scheme]]
+    game.level_index = -1
+    game.next_level()
+    open_cells = [
+        (x * m.Settings.TILE, y * m.Settings.TILE + m.Settings.TILE // 2)
+        for y, row in enumerate(scheme) for x, ch in enumerate(row) if ch == " "
+    ]
+    rng = random.Random(4)
+
+    def update() -> None:
+        level = game.level
+        # Поддерживать заданное число пуль в полёте
+        for _ in range(bullets - len(level.projectiles)):
+            level.add_projectile(m.Projectile(rng.choice(open_cells), rng.choice((-1, 1))))
+        game.update(m.Settings.FIXED_DT)
+
+    return update, game.draw
+
+
+PLATFORMER_SCENARIOS: Dict[str, Callable[[], Tuple[Step, Step]]] = {
+    "plat_empty": lambda: _platformer_game(room(20, 11)),
+    "plat_crowd": lambda: _platformer_game(crowd_level(), bullets=300),
+    "plat_huge": lambda: _platformer_game(huge_level()),
+}
+SCENARIOS = [*FLAPPY_SCENARIOS, *PLATFORMER_SCENARIOS]
+
+
+# ------------------ Замеры ------------------
+def _describe(values_ns: List[int]) -> Dict[str, float]:
+    ordered = sorted(v / 1e6 for v in values_ns)
+    return {
+        "mean": sum(ordered) / len(ordered),
+        "p95": _percentile(ordered, 95),
+        "p99": _percentile(ordered, 99),
+    }
+
+
+def _median(runs: List[Dict[str, float]]) -> Dict[str, float]:
+    return {stat: statistics.median(r[stat] for r in runs) for stat in runs[0]}
+
+
+def measure(update: Step, draw: Step, frames: int, warmup: int, alloc_frames: int, repeat: int = 5) -> Dict[str, object]:
+    """Замер сценария; по каждой метрике — медиана repeat прогонов по frames кадров."""
+    cpu, wall = time.thread_time_ns, time.perf_counter_ns
+    for _ in range(warmup):
+        update()
+        draw()
+    update_runs, draw_runs, wall_runs = [], [], []
+    for _ in range(repeat):
+        update_ns: List[int] = []
+        draw_ns: List[int] = []
+        wall_ns: List[int] = []
+        for _ in range(frames):
+            w0 = wall()
+            t0 = cpu()
+            update()
+            t1 = cpu()
+            draw()
+            t2 = cpu()
+            wall_ns.append(wall() - w0)
+            update_ns.append(t1 - t0)
+            draw_ns.append(t2 - t1)
+        update_runs.append(_describe(update_ns))
+        draw_runs.append(_describe(draw_ns))
+        wall_runs.append(_describe(wall_ns))
+
+    alloc: List[int] = []
+    blocks: List[int] = []
+    gc.collect()
+    tracemalloc.start()
+    try:
+        for _ in range(alloc_frames):
+            tracemalloc.reset_peak()
+            start_bytes = tracemalloc.get_traced_memory()[0]
+            start_blocks = sys.getallocatedblocks()
+            update()
+            draw()
+            alloc.append(tracemalloc.get_traced_memory()[1] - start_bytes)
+            blocks.append(sys.getallocatedblocks() - start_blocks)
+    finally:
+        tracemalloc.stop()
+    return {
+        "frames": frames * repeat,
+        "update_ms": _median(update_runs),
+        "draw_ms": _median(draw_runs),
+        "wall_ms": _median(wall_runs),
+        "alloc_kb": sum(alloc) / max(1, len(alloc)) / 1024,
+        "blocks": sum(blocks) / max(1, len(blocks)),
+    }
+
+
+def _metric(result: Dict[str, object], path: str) -> float:
+    value: object = result
+    for part in path.split("."):
+        value = value[part]  # type: ignore[index]
+    return float(value)  # type: ignore[arg-type]
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: Optional[float] = None) -> List[str]:
+    """Строки с регрессиями (пустой список — всё в допуске)."""
+    problems = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for path, (allowed, floor) in COMPARED.items():
+            try:
+                now, was = _metric(result, path), _metric(base, path)
+            except KeyError:  # у Flappy — кадр целиком, у платформера — update/draw
+                continue
+            if now > was * (1 + (allowed if tolerance is None else tolerance)) and now - was > floor:
+                problems.append(f"{name}: {path} {was:.3f} -> {now:.3f} (+{(now / was - 1) if was else 1:.0%})")
+    return problems
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", nargs="*", choices=sorted(SCENARIOS), help="какие сценарии гонять")
+    parser.add_argument("--frames", type=int, default=200, help="кадров в одном прогоне замера времени")
+    parser.add_argument("--repeat", type=int, default=5, help="прогонов; сравнивается медиана")
+    parser.add_argument("--warmup", type=int, default=60)
+    parser.add_argument("--alloc-frames", type=int, default=60, help="кадров под tracemalloc")
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--tolerance", type=float, default=None,
+                        help="единый допустимый рост метрики (доля) вместо допусков из COMPARED")
+    parser.add_argument("--save-baseline", action="store_true", help="записать результаты как эталон")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    results: Dict[str, Dict] = {}
+    for name in args.only or SCENARIOS:
+        if name in FLAPPY_SCENARIOS:
+            r = measure_game(name, args.frames, args.warmup, args.alloc_frames, args.repeat)
+            f = r["frame_ms"]
+            times = f"frame  {f['mean']:7.3f} p95 {f['p95']:7.3f} p99 {f['p99']:7.3f}"
+        else:
+            update, draw = PLATFORMER_SCENARIOS[name]()
+            r = measure(update, draw, args.frames, args.warmup, args.alloc_frames, args.repeat)
+            u, d = r["update_ms"], r["draw_ms"]
+            times = (f"update {u['mean']:7.3f} p95 {u['p95']:7.3f} p99 {u['p99']:7.3f} | "
+                     f"draw {d['mean']:7.3f} p95 {d['p95']:7.3f} p99 {d['p99']:7.3f}")
+        results[name] = r
+        print(f"{name:14s} {times} мс | {r['alloc_kb']:7.1f} КБ/кадр, блоков {r['blocks']:+.1f}", flush=True)
+    pygame.quit()
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "machine": platform.machine(),
+            "system": platform.system(),
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        },
+        "scenarios": results,
+    }
+    out = args.baseline if args.save_baseline else args.out
+    if args.save_baseline and os.path.exists(out):
+        # Сценарии, которые сейчас не гоняли, остаются в эталоне как были
+        with open(out, encoding="utf-8") as f:
+            report["scenarios"] = {**json.load(f)["scenarios"], **results}
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1, ensure_ascii=False)
+    print(f"результаты: {out}")
+    if args.save_baseline or not os.path.exists(args.baseline):
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    problems = compare(results, baseline["scenarios"], args.tolerance)
+    for line in problems:
+        print("РЕГРЕССИЯ", line)
+    if not problems:
+        print(f"в пределах допусков от эталона ({baseline['meta'].get('created', '?')})")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())